@@ -2,8 +2,14 @@
 Migration script to populate database with existing config data
 Run this once to migrate from config.py to SQLite
 """
-from database import Database
-from config import user_preferences
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from video_summary_bot.database.operations import Database
+from video_summary_bot.config import user_preferences
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -66,34 +72,29 @@ def migrate():
         }
     ]
 
+    # Build all rows up front so each table loads with a single executemany
+    # in one transaction instead of one round-trip per record
+    channel_rows = [
+        (c['handle'], c['name'], c['channel_id'], c['language'],
+         c['start_hour'], c['start_minute'], c['end_hour'], c['interval'])
+        for c in channels_config
+    ]
+    user_rows = [
+        (user_id, prefs.get('user_name', 'Unknown'), 1)
+        for user_id, prefs in user_preferences.items()
+    ]
+    subscription_rows = [
+        (user_id, channel)
+        for user_id, prefs in user_preferences.items()
+        for channel in prefs['channels']
+    ]
+
     logger.info("Adding channels...")
-    for channel in channels_config:
-        db.add_channel(
-            channel_handle=channel['handle'],
-            channel_name=channel['name'],
-            youtube_channel_id=channel['channel_id'],
-            language=channel['language'],
-            check_start_hour=channel['start_hour'],
-            check_start_minute=channel['start_minute'],
-            check_end_hour=channel['end_hour'],
-            check_interval_minutes=channel['interval']
-        )
+    db.add_channels_bulk(channel_rows)
 
-    # Add users and their subscriptions
     logger.info("Adding users and subscriptions...")
-    for user_id, prefs in user_preferences.items():
-        db.add_user(
-            user_id=user_id,
-            username=prefs.get('user_name', 'Unknown'),
-            wants_news=prefs.get('wants_news', True)
-        )
-
-        # Subscribe to channels
-        for channel in prefs['channels']:
-            try:
-                db.subscribe_user_to_channel(user_id, channel)
-            except ValueError as e:
-                logger.warning(f"Could not subscribe {user_id} to {channel}: {e}")
+    db.add_users_bulk(user_rows)
+    db.add_subscriptions_bulk(subscription_rows)
 
     logger.info("Migration completed successfully!")
 
@@ -105,4 +106,4 @@ def migrate():
         logger.info(f"  {channel['channel_handle']}: {len(subscribers)} subscribers")
 
 if __name__ == "__main__":
-    migrate()
\ No newline at end of file
+    migrate()
@@ -10,9 +10,92 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 from dotenv import load_dotenv
 load_dotenv()
 
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import event
+
 from video_summary_bot.database.operations import Database as SQLiteDB
 from video_summary_bot.database.postgres_operations import PostgresDatabase
-import sqlite3
+
+
+def migrate_users(sqlite_db, postgres_db):
+    """Migrate users; returns the number of users migrated"""
+    print("\n📋 Migrating users...")
+    users = sqlite_db.get_all_users(active_only=False)
+    postgres_db.add_users_bulk([
+        (user['user_id'], user['username'], int(user['active']))
+        for user in users
+    ])
+    print(f"   Total users migrated: {len(users)}")
+    return len(users)
+
+
+def migrate_channels(sqlite_db, postgres_db):
+    """Migrate channels; returns the number of channels migrated"""
+    print("\n📋 Migrating channels...")
+    channels = sqlite_db.get_all_channels(active_only=False)
+    postgres_db.add_channels_bulk([
+        (channel['channel_handle'],
+         channel.get('channel_name'),
+         channel.get('youtube_channel_id'),
+         channel.get('language', 'es'),
+         channel.get('check_start_hour', 10),
+         channel.get('check_start_minute', 0),
+         channel.get('check_end_hour', 14),
+         channel.get('check_interval_minutes', 5))
+        for channel in channels
+    ])
+    print(f"   Total channels migrated: {len(channels)}")
+    return len(channels)
+
+
+def migrate_subscriptions(sqlite_db, postgres_db):
+    """Migrate subscriptions; returns (sqlite_count, migrated_count)"""
+    print("\n📋 Migrating user subscriptions...")
+    # Export handles, not channel ids: the Postgres SERIAL ids assigned
+    # by migrate_channels need not match the SQLite AUTOINCREMENT ones
+    with sqlite_db.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT uc.user_id, c.channel_handle
+            FROM user_channels uc
+            INNER JOIN channels c ON uc.channel_id = c.channel_id
+        ''')
+        subscriptions = cursor.fetchall()
+
+    pairs = [(sub['user_id'], sub['channel_handle']) for sub in subscriptions]
+    subscription_count = postgres_db.add_subscriptions_bulk(pairs)
+
+    print(f"   Total subscriptions migrated: {subscription_count}")
+    return len(subscriptions), subscription_count
+
+
+def migrate_summaries(sqlite_db, postgres_db):
+    """Migrate summaries via COPY; returns (sqlite_count, migrated_count)"""
+    print("\n📋 Migrating video summaries...")
+
+    def iter_summaries(cur, batch_size=1000):
+        """Yield summary rows one fetchmany batch at a time"""
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                break
+            yield from rows
+
+    with sqlite_db.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT COUNT(*) FROM summaries')
+        sqlite_summary_count = cursor.fetchone()[0]
+        cursor.execute('''
+            SELECT channel_handle, video_id, video_title, video_url,
+                   summary_text, video_date, success
+            FROM summaries ORDER BY processed_at
+        ''')
+        summary_count = postgres_db.copy_summaries(
+            tuple(row) for row in iter_summaries(cursor)
+        )
+    print(f"   ✅ Total summaries migrated: {summary_count}")
+    return sqlite_summary_count, summary_count
 
 
 def migrate_data():
@@ -36,96 +119,45 @@ def migrate_data():
     postgres_db = PostgresDatabase(database_url)
     print("   ✅ Connected to both databases")
 
-    # Migrate users
-    print("\n2. Migrating users...")
-    users = sqlite_db.get_all_users(active_only=False)
-    for user in users:
-        postgres_db.add_user(
-            user_id=user['user_id'],
-            username=user['username'],
-            active=bool(user['active'])
-        )
-        print(f"   ✅ Migrated user: {user['username']} ({user['user_id']})")
-    print(f"   Total users migrated: {len(users)}")
-
-    # Migrate channels
-    print("\n3. Migrating channels...")
-    channels = sqlite_db.get_all_channels(active_only=False)
-    for channel in channels:
-        postgres_db.add_channel(
-            channel_handle=channel['channel_handle'],
-            channel_name=channel.get('channel_name'),
-            youtube_channel_id=channel.get('youtube_channel_id'),
-            language=channel.get('language', 'es'),
-            check_start_hour=channel.get('check_start_hour', 10),
-            check_start_minute=channel.get('check_start_minute', 0),
-            check_end_hour=channel.get('check_end_hour', 14),
-            check_interval_minutes=channel.get('check_interval_minutes', 5)
-        )
-        print(f"   ✅ Migrated channel: {channel['channel_handle']}")
-    print(f"   Total channels migrated: {len(channels)}")
-
-    # Migrate user-channel subscriptions
-    print("\n4. Migrating user subscriptions...")
-    with sqlite_db.get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute('SELECT * FROM user_channels')
-        subscriptions = cursor.fetchall()
-
-    subscription_count = 0
-    for sub in subscriptions:
-        try:
-            postgres_db.subscribe_user_to_channel(
-                user_id=sub['user_id'],
-                channel_id=sub['channel_id']
-            )
-            subscription_count += 1
-        except Exception as e:
-            print(f"   ⚠️  Warning: {e}")
-
-    print(f"   Total subscriptions migrated: {subscription_count}")
-
-    # Migrate summaries
-    print("\n5. Migrating video summaries...")
-    with sqlite_db.get_connection() as conn:
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute('SELECT * FROM summaries ORDER BY processed_at')
-        summaries = cursor.fetchall()
-
-    summary_count = 0
-    for summary in summaries:
-        # Convert Row to dict for easier access
-        summary_dict = dict(summary)
-        postgres_db.add_summary(
-            channel_handle=summary_dict['channel_handle'],
-            video_id=summary_dict.get('video_id', ''),
-            video_title=summary_dict.get('video_title', ''),
-            video_url=summary_dict.get('video_url', ''),
-            summary_text=summary_dict.get('summary_text', ''),
-            video_date=summary_dict.get('video_date'),
-            success=bool(summary_dict.get('success', 1))
-        )
-        summary_count += 1
-        if summary_count % 10 == 0:
-            print(f"   Migrated {summary_count} summaries...")
-
-    print(f"   ✅ Total summaries migrated: {summary_count}")
+    # This is a one-shot, rebuildable load: skip the WAL fsync wait on
+    # every commit for the migration's connections. The setting dies with
+    # the connections, so normal durability is back once the script exits.
+    @event.listens_for(postgres_db.engine, "connect")
+    def _disable_synchronous_commit(dbapi_conn, connection_record):
+        with dbapi_conn.cursor() as cur:
+            cur.execute("SET synchronous_commit = OFF")
+
+    # Recycle the connection used for schema init so every pooled
+    # connection picks up the setting
+    postgres_db.engine.dispose()
+
+    # Users and channels have no mutual dependency, so they load
+    # concurrently; subscriptions and summaries only need both done first.
+    # Each worker gets its own connection from the engine pool.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        users_future = executor.submit(migrate_users, sqlite_db, postgres_db)
+        channels_future = executor.submit(migrate_channels, sqlite_db, postgres_db)
+        user_count = users_future.result()
+        channel_count = channels_future.result()
+
+        subs_future = executor.submit(migrate_subscriptions, sqlite_db, postgres_db)
+        summaries_future = executor.submit(migrate_summaries, sqlite_db, postgres_db)
+        sub_total, subscription_count = subs_future.result()
+        sqlite_summary_count, summary_count = summaries_future.result()
 
     # Verification
     print("\n" + "=" * 70)
     print("✅ Migration Complete! Verification:")
     print("=" * 70)
 
-    # Verify counts
-    pg_users = postgres_db.get_all_users(active_only=False)
-    pg_channels = postgres_db.get_all_channels(active_only=False)
+    # Verify counts (one query, three scalars — no row transfer)
+    pg_user_count, pg_channel_count, pg_summary_count = postgres_db.get_migration_counts()
 
     print(f"\n📊 Summary:")
-    print(f"   Users:         {len(users)} (SQLite) → {len(pg_users)} (PostgreSQL)")
-    print(f"   Channels:      {len(channels)} (SQLite) → {len(pg_channels)} (PostgreSQL)")
-    print(f"   Subscriptions: {len(subscriptions)} (SQLite) → {subscription_count} (PostgreSQL)")
-    print(f"   Summaries:     {len(summaries)} (SQLite) → {summary_count} (PostgreSQL)")
+    print(f"   Users:         {user_count} (SQLite) → {pg_user_count} (PostgreSQL)")
+    print(f"   Channels:      {channel_count} (SQLite) → {pg_channel_count} (PostgreSQL)")
+    print(f"   Subscriptions: {sub_total} (SQLite) → {subscription_count} (PostgreSQL)")
+    print(f"   Summaries:     {sqlite_summary_count} (SQLite) → {pg_summary_count} (PostgreSQL)")
 
     print("\n✅ All data migrated successfully!")
     print("\n" + "=" * 70)
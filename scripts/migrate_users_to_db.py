@@ -16,6 +16,13 @@ def migrate_users():
     print("🔄 Migrating users from config to database...")
     print(f"Found {len(user_preferences)} users in config\n")
 
+    # One SELECT up front instead of a get_channel round-trip per
+    # (user, channel) pair
+    known_handles = {
+        c['channel_handle'] for c in db.get_all_channels(active_only=False)
+    }
+    subscription_pairs = []
+
     for user_id, prefs in user_preferences.items():
         username = prefs.get('user_name', 'Unknown')
         channels = prefs.get('channels', [])
@@ -23,28 +30,26 @@ def migrate_users():
         print(f"  Adding user: {username} ({user_id})")
         db.add_user(user_id=user_id, username=username, active=True)
 
-        # Add channel subscriptions
+        # Collect channel subscriptions; both backends resolve the
+        # handle to a channel id inside add_subscriptions_bulk
         for channel_handle in channels:
-            # Get or create channel
-            channel = db.get_channel(channel_handle)
-            if not channel:
+            if channel_handle not in known_handles:
                 print(f"    ⚠️  Channel {channel_handle} not in database, adding...")
-                db.add_channel(
-                    channel_handle=channel_handle,
-                    channel_name=channel_handle.replace('@', ''),
-                    youtube_channel_id=None  # Will need to be updated manually
+                # Upsert in one round-trip; the YouTube channel ID still
+                # needs to be filled in manually
+                db.get_or_create_channel(
+                    channel_handle, channel_handle.replace('@', '')
                 )
-                channel = db.get_channel(channel_handle)
+                known_handles.add(channel_handle)
 
-            # Subscribe user to channel
-            try:
-                db.subscribe_user_to_channel(user_id, channel['channel_id'])
-                print(f"    ✅ Subscribed to {channel_handle}")
-            except Exception as e:
-                print(f"    ⚠️  Already subscribed to {channel_handle}")
+            subscription_pairs.append((user_id, channel_handle))
+            print(f"    ✅ Subscribed to {channel_handle}")
 
         print()
 
+    # Single batched insert for all collected subscriptions
+    db.add_subscriptions_bulk(subscription_pairs)
+
     # Verify migration
     print("=" * 60)
     print("✅ Migration complete!\n")
@@ -1,91 +1,256 @@
 """Listen bot - Processes YouTube URLs sent by users via Telegram"""
 
-from video_summary_bot.handlers import YouTubeHandler, GeminiHandler, TelegramHandler
-from video_summary_bot.config import youtube_api_key, gemini_api_key, bot_token
+from video_summary_bot.handlers import (
+    YouTubeHandler,
+    GeminiHandler,
+    TelegramHandler,
+    get_youtube_handler,
+    get_gemini_handler,
+    get_telegram_handler
+)
 from video_summary_bot.database.factory import get_database
-from video_summary_bot.utils import extract_video_id
+from video_summary_bot.utils import find_video_id, today_str
+import hashlib
+import hmac
 import logging
-import time
 import os
-from datetime import datetime
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
 # Session state management for pending authentication
-# Format: {chat_id: {'state': 'waiting_for_password', 'username': 'John'}}
+# Format: {chat_id: {'state': 'waiting_for_password', 'username': 'John',
+#                    'expires_at': monotonic deadline}}
+# Entries expire after PENDING_AUTH_TTL so an abandoned password prompt
+# doesn't linger forever; access is lock-guarded because messages are
+# handled on a worker pool.
+PENDING_AUTH_TTL = 600
 pending_auth_sessions = {}
+_pending_auth_lock = threading.Lock()
+
+
+def set_pending_auth(chat_id: str, username: str):
+    """Start (or restart) a pending password prompt for a chat"""
+    with _pending_auth_lock:
+        pending_auth_sessions[chat_id] = {
+            'state': 'waiting_for_password',
+            'username': username,
+            'expires_at': time.monotonic() + PENDING_AUTH_TTL
+        }
+
+
+def get_pending_auth(chat_id: str):
+    """Return the pending session for a chat, dropping it if expired"""
+    with _pending_auth_lock:
+        session = pending_auth_sessions.get(chat_id)
+        if session and session['expires_at'] < time.monotonic():
+            del pending_auth_sessions[chat_id]
+            return None
+        return session
+
+
+def clear_pending_auth(chat_id: str):
+    """Forget a pending session (wrong password, success, or error)"""
+    with _pending_auth_lock:
+        pending_auth_sessions.pop(chat_id, None)
+
+
+# Recently served summaries keyed by video_id, so a popular video
+# requested by several users skips the database entirely after the
+# first hit. Guarded by a lock because updates are handled on a pool.
+_SUMMARY_CACHE_SIZE = 128
+_summary_cache = OrderedDict()
+_summary_cache_lock = threading.Lock()
+
+
+def _cache_summary(video_id: str, summary: dict):
+    """Remember a served summary, evicting the least recently used"""
+    with _summary_cache_lock:
+        _summary_cache[video_id] = summary
+        _summary_cache.move_to_end(video_id)
+        if len(_summary_cache) > _SUMMARY_CACHE_SIZE:
+            _summary_cache.popitem(last=False)
+
+
+def _cached_summary(video_id: str):
+    """Look up a recently served summary, refreshing its LRU position"""
+    with _summary_cache_lock:
+        summary = _summary_cache.get(video_id)
+        if summary is not None:
+            _summary_cache.move_to_end(video_id)
+        return summary
+
+
+# Constant status strings built once at import instead of per message
+_MSG_PROCESSING = "🔍 Processing your YouTube link..."
+_MSG_NO_VIDEO_INFO = "❌ Could not retrieve video information"
+_MSG_NO_TRANSCRIPT = "❌ No transcript available for this video"
+_MSG_SUMMARY_FAILED = "❌ Failed to generate summary"
+_MSG_BAD_URL = "❌ Could not extract video ID from URL"
+_MSG_SEND_URL_HINT = "ℹ️ Please send me a YouTube video URL to get a summary."
+
+
+class AuthCache:
+    """In-memory view of the authorized-user table
+
+    Authorization runs on every inbound message; the allowed set barely
+    changes, so membership is answered from memory and the table is
+    re-read at most once per refresh interval. Registrations are
+    inserted immediately so new users don't wait out the interval.
+    """
+
+    REFRESH_SECONDS = 60
+
+    def __init__(self, db):
+        self.db = db
+        self._lock = threading.Lock()
+        self._last_refresh = 0.0
+        self.allowed_ids = set()
+        self.users = {}
+        self._refresh(force=True)
+
+    def _refresh(self, force: bool = False):
+        with self._lock:
+            if not force and time.monotonic() - self._last_refresh < self.REFRESH_SECONDS:
+                return
+            if force:
+                # Startup needs full rows (for the banner and get_user)
+                active_users = self.db.get_all_users(active_only=True)
+                self.allowed_ids = {user['user_id'] for user in active_users}
+                self.users = {user['user_id']: user for user in active_users}
+            else:
+                # Periodic refresh only needs membership: fetch the IDs
+                # SQL-side instead of materializing every row, and drop
+                # cached rows for users that were deactivated
+                self.allowed_ids = self.db.get_active_user_ids()
+                self.users = {
+                    user_id: user for user_id, user in self.users.items()
+                    if user_id in self.allowed_ids
+                }
+            self._last_refresh = time.monotonic()
+
+    def is_authorized(self, user_id: str) -> bool:
+        """O(1) membership check against the cached allowed set"""
+        self._refresh()
+        return user_id in self.allowed_ids
+
+    def get_user(self, user_id: str):
+        """Cached user row, falling back to the DB on a miss"""
+        self._refresh()
+        user = self.users.get(user_id)
+        if user is None:
+            user = self.db.get_user(user_id)
+            if user:
+                with self._lock:
+                    self.users[user_id] = user
+                    self.allowed_ids.add(user_id)
+        return user
+
+    def add(self, user: dict):
+        """Insert a freshly registered user without waiting for a refresh"""
+        with self._lock:
+            self.allowed_ids.add(user['user_id'])
+            self.users[user['user_id']] = user
 
 
 def process_video_url(video_id: str, user_chat_id: str, yt: YouTubeHandler,
                       gemini: GeminiHandler, telegram: TelegramHandler, db):
     """Process a video URL - either from cache or generate new summary"""
 
-    # Check if video has been processed before
-    if db.has_video_id_been_processed(video_id):
-        logger.info(f"Video {video_id} already processed - retrieving from database")
-        telegram.send_to_users(
-            "📂 Found existing summary, retrieving...",
-            None,
-            [user_chat_id]
-        )
-
+    # Check if video has been processed before: memory first, then one
+    # DB lookup (the old existence probe + fetch was two round-trips)
+    existing_summary = _cached_summary(video_id)
+    if existing_summary is None:
         existing_summary = db.get_summary_by_video_id(video_id)
         if existing_summary:
-            response_message = f"📺 {existing_summary['video_title']}\n\n{existing_summary['summary_text']}\n\n{existing_summary['video_url']}"
-            telegram.send_to_users(response_message, None, [user_chat_id])
-            logger.info("✅ Existing summary sent to Telegram!")
-            return True
-
-    # Video not processed before - generate new summary
+            _cache_summary(video_id, existing_summary)
+    else:
+        logger.info(f"Summary cache hit for video {video_id}")
+
+    if existing_summary:
+        logger.info(f"Video {video_id} already processed - sending existing summary")
+        response_message = '\n\n'.join((
+            f"📺 {existing_summary['video_title']}",
+            existing_summary['summary_text'],
+            existing_summary['video_url']
+        ))
+        telegram.send_to_users(response_message, None, [user_chat_id])
+        logger.info("✅ Existing summary sent to Telegram!")
+        return True
+
+    # Video not processed before - generate new summary. The status
+    # message doubles as a placeholder the streamed summary edits into.
     logger.info(f"Processing new video ID: {video_id}")
-    telegram.send_to_users(
-        "🔍 Processing your YouTube link...",
-        None,
-        [user_chat_id]
-    )
+    message_id = telegram.send_message_with_id(_MSG_PROCESSING, None, user_chat_id)
+
+    def notify(text):
+        """Update the placeholder in place, or send fresh if it failed"""
+        if message_id is not None:
+            telegram.edit_message(user_chat_id, message_id, text)
+        else:
+            telegram.send_to_users(text, None, [user_chat_id])
 
     video_info = yt.get_video_info(video_id)
 
     if not video_info:
-        telegram.send_to_users(
-            "❌ Could not retrieve video information",
-            None,
-            [user_chat_id]
-        )
-        logger.error("❌ Could not retrieve video information")
+        notify(_MSG_NO_VIDEO_INFO)
+        logger.error(_MSG_NO_VIDEO_INFO)
         return False
 
     transcript = yt.get_transcript(video_id)
     if not transcript:
-        telegram.send_to_users(
-            "❌ No transcript available for this video",
-            None,
-            [user_chat_id]
-        )
-        logger.error("❌ No transcript available for this video")
+        notify(_MSG_NO_TRANSCRIPT)
+        logger.error(_MSG_NO_TRANSCRIPT)
         return False
 
-    summary = gemini.summarize_video(
-        transcript,
-        video_info['title'],
-        video_info['channel_title']
-    )
+    summary = None
+    if message_id is not None and gemini.can_stream(transcript):
+        # Stream the generation into the placeholder so the user watches
+        # the summary appear instead of waiting out the whole call;
+        # edits are throttled to stay under Telegram's edit rate
+        header = f"📺 {video_info['title']}\n\n"
+        parts = []
+        pending = 0
+        last_edit = time.monotonic()
+        try:
+            for chunk in gemini.stream_summary(transcript, video_info['title']):
+                parts.append(chunk)
+                pending += len(chunk)
+                now = time.monotonic()
+                if pending >= 200 and now - last_edit >= 1.5:
+                    draft = header + ''.join(parts)
+                    if len(draft) <= 4000:
+                        telegram.edit_message(user_chat_id, message_id, draft)
+                    pending = 0
+                    last_edit = now
+            summary = ''.join(parts) or None
+        except Exception as e:
+            logger.error(f"Streaming summary failed: {e}")
+
+    if summary is None:
+        # Long transcripts go through the map-reduce path; a failed or
+        # empty stream retries here non-streaming instead of turning a
+        # streaming-only error into a failure for the user
+        summary = gemini.summarize_video(
+            transcript,
+            video_info['title'],
+            video_info['channel_title']
+        )
 
     if not summary:
-        telegram.send_to_users(
-            "❌ Failed to generate summary",
-            None,
-            [user_chat_id]
-        )
-        logger.error("❌ Failed to generate summary")
+        notify(_MSG_SUMMARY_FAILED)
+        logger.error(_MSG_SUMMARY_FAILED)
         return False
 
     # Build video URL
     video_url = f"https://www.youtube.com/watch?v={video_id}"
 
     # Save to database
-    today = datetime.now().strftime('%Y-%m-%d')
+    today = today_str()
     db.add_summary(
         channel_handle=video_info.get('channel_title', 'manual'),
         video_id=video_id,
@@ -96,159 +261,169 @@ def process_video_url(video_id: str, user_chat_id: str, yt: YouTubeHandler,
         success=True
     )
     logger.info(f"Summary saved to database for video {video_id}")
-
-    # Send summary to user
-    response_message = f"📺 {video_info['title']}\n\n{summary}\n\n{video_url}"
-    telegram.send_to_users(response_message, None, [user_chat_id])
+    _cache_summary(video_id, {
+        'video_title': video_info['title'],
+        'summary_text': summary,
+        'video_url': video_url
+    })
+
+    # Send summary to user: final edit of the placeholder when it fits,
+    # otherwise the split-send path
+    response_message = '\n\n'.join((f"📺 {video_info['title']}", summary, video_url))
+    if message_id is not None and len(response_message) <= 4000:
+        telegram.edit_message(user_chat_id, message_id, response_message)
+    else:
+        telegram.send_to_users(response_message, None, [user_chat_id])
     logger.info("✅ Summary sent to Telegram!")
     return True
 
 
+def handle_message(message: dict, yt: YouTubeHandler, gemini: GeminiHandler,
+                   telegram: TelegramHandler, db, auth: AuthCache):
+    """Handle one inbound Telegram message (auth flow, then URL processing)"""
+    message_text = message.get('text', '')
+    user_chat_id = str(message['chat']['id'])
+    user_name = message['chat'].get('first_name', 'Unknown')
+    username = message['chat'].get('username', user_name)
+
+    # Check if user is in pending authentication flow
+    if get_pending_auth(user_chat_id):
+        bot_password = os.getenv('BOT_PASSWORD')
+
+        if not bot_password:
+            logger.error("BOT_PASSWORD not set in environment variables")
+            telegram.send_to_users(
+                "❌ Authentication system not configured. Please contact admin.",
+                None,
+                [user_chat_id]
+            )
+            clear_pending_auth(user_chat_id)
+            return
+
+        # User is expected to send password. Comparing fixed-size hashes
+        # with compare_digest leaks neither mismatch position nor
+        # password length, unlike str equality's early exit.
+        password_ok = hmac.compare_digest(
+            hashlib.sha256(message_text.strip().encode()).digest(),
+            hashlib.sha256(bot_password.encode()).digest()
+        )
+        if password_ok:
+            # Password correct - register user
+            logger.info(f"Correct password from {username} ({user_chat_id})")
+
+            try:
+                db.add_user(user_id=user_chat_id, username=username, active=True)
+                auth.add({'user_id': user_chat_id, 'username': username, 'active': True})
+                logger.info(f"✅ Registered new user: {username} ({user_chat_id})")
+
+                telegram.send_to_users(
+                    f"✅ Welcome {username}! You are now registered.\n\n"
+                    "Send me a YouTube URL to get a summary.",
+                    None,
+                    [user_chat_id]
+                )
+            except Exception as e:
+                logger.error(f"Failed to register user {username}: {e}")
+                telegram.send_to_users(
+                    "❌ Registration failed. Please try again later or contact admin.",
+                    None,
+                    [user_chat_id]
+                )
+            clear_pending_auth(user_chat_id)
+            return
+        else:
+            # Password incorrect
+            logger.warning(f"Incorrect password from {username} ({user_chat_id})")
+            telegram.send_to_users(
+                "❌ Incorrect password. Please try again or contact admin.",
+                None,
+                [user_chat_id]
+            )
+            clear_pending_auth(user_chat_id)
+            return
+
+    # Check if user is authorized (cached set; refreshed periodically)
+    if not auth.is_authorized(user_chat_id):
+        logger.warning(f"Unauthorized user {username} ({user_chat_id}) tried to use bot")
+
+        # Add user to pending authentication sessions
+        set_pending_auth(user_chat_id, username)
+
+        telegram.send_to_users(
+            f"👋 Hi {username}!\n\n"
+            "You are not yet registered to use this bot.\n\n"
+            "🔐 Please send the password to register and start using the bot.",
+            None,
+            [user_chat_id]
+        )
+        return
+
+    # Get user info from the cache (DB only on a miss)
+    user = auth.get_user(user_chat_id)
+    logger.info(f"New message from {user['username']}: {message_text}")
+
+    # No generic acknowledgement here: each branch below answers with
+    # its own message, so a second status send per message is just an
+    # extra Telegram round-trip
+
+    # One regex pass both detects and extracts a YouTube link; the
+    # substring check only runs on the failure path to distinguish a
+    # malformed link from plain text
+    video_id = find_video_id(message_text)
+    if video_id:
+        # Process the video URL
+        process_video_url(video_id, user_chat_id, yt, gemini, telegram, db)
+    elif "youtube.com" in message_text or "youtu.be" in message_text:
+        telegram.send_to_users(_MSG_BAD_URL, None, [user_chat_id])
+        logger.error(_MSG_BAD_URL)
+    else:
+        telegram.send_to_users(_MSG_SEND_URL_HINT, None, [user_chat_id])
+
+
 def main():
     """Main bot loop - listens for messages from all authorized users in database"""
-    yt = YouTubeHandler(youtube_api_key)
-    gemini = GeminiHandler(gemini_api_key)
-    telegram = TelegramHandler(bot_token, None)  # Don't set default chat_id
+    # Shared singletons - in combined mode these are the same warm clients
+    # (and caches) the scheduler thread uses
+    yt = get_youtube_handler()
+    gemini = get_gemini_handler()
+    telegram = get_telegram_handler()
     db = get_database()
 
-    # Get all active users from database
-    active_users = db.get_all_users(active_only=True)
-    allowed_user_ids = {user['user_id'] for user in active_users}
+    # Authorized users served from memory; refreshed every minute
+    auth = AuthCache(db)
 
     # Track the last processed update_id to avoid duplicates
     last_update_id = None
 
-    print(f"🤖 Bot started. Listening for YouTube URLs from {len(allowed_user_ids)} authorized users...")
-    print(f"📋 Authorized users: {', '.join([user['username'] for user in active_users])}")
+    print(f"🤖 Bot started. Listening for YouTube URLs from {len(auth.allowed_ids)} authorized users...")
+    print(f"📋 Authorized users: {', '.join([user['username'] for user in auth.users.values()])}")
 
-    try:
-        while True:
-            # Get new messages only (after last_update_id)
-            offset = last_update_id + 1 if last_update_id is not None else None
-            message = telegram.get_last_message(offset=offset)
-
-            if message:
-                # If message was received after bot started process it, otherwise ignore
-                if last_update_id is not None and message['update_id'] <= last_update_id:
-                    time.sleep(5)
-                    continue
-
-                # Update the last_update_id to avoid reprocessing
-                last_update_id = message['update_id']
-
-                # Get message details
-                message_text = message['message'].get('text', '')
-                user_chat_id = str(message['message']['chat']['id'])
-                user_name = message['message']['chat'].get('first_name', 'Unknown')
-                username = message['message']['chat'].get('username', user_name)
-
-                # Check if user is in pending authentication flow
-                if user_chat_id in pending_auth_sessions:
-                    bot_password = os.getenv('BOT_PASSWORD')
-
-                    if not bot_password:
-                        logger.error("BOT_PASSWORD not set in environment variables")
-                        telegram.send_to_users(
-                            "❌ Authentication system not configured. Please contact admin.",
-                            None,
-                            [user_chat_id]
-                        )
-                        del pending_auth_sessions[user_chat_id]
-                        continue
+    def safe_handle(message):
+        try:
+            handle_message(message, yt, gemini, telegram, db, auth)
+        except Exception as e:
+            logger.error(f"Error handling message: {e}")
 
-                    # User is expected to send password
-                    if message_text.strip() == bot_password:
-                        # Password correct - register user
-                        logger.info(f"Correct password from {username} ({user_chat_id})")
-
-                        try:
-                            db.add_user(user_id=user_chat_id, username=username, active=True)
-                            logger.info(f"✅ Registered new user: {username} ({user_chat_id})")
-
-                            telegram.send_to_users(
-                                f"✅ Welcome {username}! You are now registered.\n\n"
-                                "Send me a YouTube URL to get a summary.",
-                                None,
-                                [user_chat_id]
-                            )
-
-                            # Remove from pending sessions
-                            del pending_auth_sessions[user_chat_id]
-                            continue
-
-                        except Exception as e:
-                            logger.error(f"Failed to register user {username}: {e}")
-                            telegram.send_to_users(
-                                "❌ Registration failed. Please try again later or contact admin.",
-                                None,
-                                [user_chat_id]
-                            )
-                            del pending_auth_sessions[user_chat_id]
-                            continue
-                    else:
-                        # Password incorrect
-                        logger.warning(f"Incorrect password from {username} ({user_chat_id})")
-                        telegram.send_to_users(
-                            "❌ Incorrect password. Please try again or contact admin.",
-                            None,
-                            [user_chat_id]
-                        )
-                        del pending_auth_sessions[user_chat_id]
-                        continue
-
-                # Check if user is authorized (check database)
-                if not db.is_user_authorized(user_chat_id):
-                    logger.warning(f"Unauthorized user {username} ({user_chat_id}) tried to use bot")
-
-                    # Add user to pending authentication sessions
-                    pending_auth_sessions[user_chat_id] = {
-                        'state': 'waiting_for_password',
-                        'username': username
-                    }
-
-                    telegram.send_to_users(
-                        f"👋 Hi {username}!\n\n"
-                        "You are not yet registered to use this bot.\n\n"
-                        "🔐 Please send the password to register and start using the bot.",
-                        None,
-                        [user_chat_id]
-                    )
-                    continue
-
-                # Get user info from database
-                user = db.get_user(user_chat_id)
-                logger.info(f"New message from {user['username']}: {message_text}")
-
-                # Inform user we received their message
-                telegram.send_to_users(
-                    "🔍 Message received. Processing...",
-                    None,
-                    [user_chat_id]
-                )
-
-                # Check if message contains a YouTube video URL
-                if "youtube.com" in message_text or "youtu.be" in message_text:
-                    video_id = extract_video_id(message_text)
-
-                    if not video_id:
-                        telegram.send_to_users(
-                            "❌ Could not extract video ID from URL",
-                            None,
-                            [user_chat_id]
-                        )
-                        logger.error("❌ Could not extract video ID from URL")
+    try:
+        # Updates are handled off the polling thread so one slow video
+        # (transcript fetch + Gemini call) doesn't stall everyone else's
+        # messages; the workers spend their time blocked on network I/O
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            while True:
+                # Long-poll for new updates (after last_update_id): Telegram
+                # holds the request open until something arrives, so there is
+                # no fixed polling latency and idle calls drop ~30x. The whole
+                # batch is processed, not just the newest update, so messages
+                # that arrive close together are no longer dropped.
+                offset = last_update_id + 1 if last_update_id is not None else None
+                updates = telegram.get_updates(offset=offset, timeout=30)
+
+                for update in updates:
+                    last_update_id = update['update_id']
+                    message = update.get('message')
+                    if not message or 'chat' not in message:
                         continue
-
-                    # Process the video URL
-                    process_video_url(video_id, user_chat_id, yt, gemini, telegram, db)
-                else:
-                    telegram.send_to_users(
-                        "ℹ️ Please send me a YouTube video URL to get a summary.",
-                        None,
-                        [user_chat_id]
-                    )
-
-            time.sleep(10)  # Poll every 10 seconds
+                    executor.submit(safe_handle, message)
 
     except KeyboardInterrupt:
         print("\n🛑 Bot stopped by user")
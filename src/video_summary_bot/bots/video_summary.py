@@ -1,7 +1,12 @@
 """Video summary bot - Processes today's videos from configured channels"""
 
-from video_summary_bot.handlers import YouTubeHandler, GeminiHandler, TelegramHandler
-from video_summary_bot.config import youtube_api_key, gemini_api_key, bot_token
+from concurrent.futures import ThreadPoolExecutor
+
+from video_summary_bot.handlers import (
+    get_youtube_handler,
+    get_gemini_handler,
+    get_telegram_handler
+)
 from video_summary_bot.database import Database
 import logging
 
@@ -9,47 +14,63 @@ logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
 
+def process_channel(channel_handle, target_users, yt, gemini, telegram):
+    """Fetch, summarize and send today's video for a single channel"""
+    if not target_users:
+        logger.info(f"No subscribers for {channel_handle}, skipping")
+        return
+
+    # Get today's video
+    video_data = yt.get_video_info_with_transcript(channel_handle)
+
+    if video_data and 'transcript' in video_data:
+        summary = gemini.summarize_video(
+            video_data['transcript'],
+            video_data['title'],
+            video_data['channel_title']
+        )
+        if summary:
+            message = f"📺 {video_data['title']}\n\n{summary}"
+            telegram.send_to_users(message, None, target_users)
+            print(f"✅ Summary sent for {channel_handle}!")
+        else:
+            print(f"❌ Failed to generate summary for {channel_handle}")
+    else:
+        print(f"ℹ️  No video or transcript found for {channel_handle}")
+
+
 def main():
     """Main bot execution - processes channels from database"""
-    yt = YouTubeHandler(youtube_api_key)
-    gemini = GeminiHandler(gemini_api_key)
-    telegram = TelegramHandler(bot_token, None)
+    # Shared singletons so the HTTP pools and summary cache survive
+    # across invocations in the same process
+    yt = get_youtube_handler()
+    gemini = get_gemini_handler()
+    telegram = get_telegram_handler()
     db = Database()
 
-    # Get all active channels from database
-    channels = db.get_all_channels(active_only=True)
+    # Only handles drive the processing loop, so skip fetching (and
+    # dict-ifying) the full channel rows
+    channels = db.get_active_channel_handles()
 
     if not channels:
         print("⚠️  No active channels found in database")
         return
 
-    for channel in channels:
-        channel_handle = channel['channel_handle']
-
-        # Get users subscribed to this channel
-        target_users = db.get_channel_subscribers(channel_handle)
-
-        if not target_users:
-            logger.info(f"No subscribers for {channel_handle}, skipping")
-            continue
-
-        # Get today's video
-        video_data = yt.get_video_info_with_transcript(channel_handle)
-
-        if video_data and 'transcript' in video_data:
-            summary = gemini.summarize_video(
-                video_data['transcript'],
-                video_data['title'],
-                video_data['channel_title']
-            )
-            if summary:
-                message = f"📺 {video_data['title']}\n\n{summary}"
-                telegram.send_to_users(message, None, target_users)
-                print(f"✅ Summary sent for {channel_handle}!")
-            else:
-                print(f"❌ Failed to generate summary for {channel_handle}")
-        else:
-            print(f"ℹ️  No video or transcript found for {channel_handle}")
+    # One joined query gives every channel its subscriber list, instead
+    # of a round-trip per channel inside the loop
+    subscribers_map = db.get_channel_subscribers_map()
+
+    # Each channel is independent network-bound work (YouTube fetch, Gemini
+    # summarize, Telegram send), so fan out and let the round-trips overlap
+    with ThreadPoolExecutor(max_workers=len(channels)) as executor:
+        list(executor.map(
+            lambda handle: process_channel(
+                handle,
+                subscribers_map.get(handle, []),
+                yt, gemini, telegram
+            ),
+            channels
+        ))
 
 
 if __name__ == "__main__":
@@ -1,6 +1,8 @@
 """Configuration module"""
 
 from .settings import (
+    Settings,
+    get_settings,
     youtube_api_key,
     gemini_api_key,
     bot_token,
@@ -10,6 +12,8 @@ from .settings import (
 from .users import user_preferences
 
 __all__ = [
+    'Settings',
+    'get_settings',
     'youtube_api_key',
     'gemini_api_key',
     'bot_token',
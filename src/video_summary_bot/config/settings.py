@@ -1,18 +1,45 @@
 """Application settings and API keys"""
 
 import os
+from dataclasses import dataclass
+from functools import lru_cache
 from dotenv import load_dotenv
 import logging
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
-load_dotenv()
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Immutable snapshot of environment-driven configuration"""
+    youtube_api_key: str = None
+    gemini_api_key: str = None
+    bot_token: str = None
+    chat_id: str = None
+    bot_password: str = None
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Parse .env and read the environment exactly once per process"""
+    load_dotenv()
+    return Settings(
+        youtube_api_key=os.getenv('YOUTUBE_API_KEY'),
+        gemini_api_key=os.getenv('GEMINI_API_KEY'),
+        bot_token=os.getenv('TELEGRAM_BOT_TOKEN'),
+        chat_id=os.getenv('TELEGRAM_CHAT_ID'),
+        bot_password=os.getenv('BOT_PASSWORD')
+    )
+
+
+_settings = get_settings()
 
 # Load API keys
-youtube_api_key = os.getenv('YOUTUBE_API_KEY')
-gemini_api_key = os.getenv('GEMINI_API_KEY')
-bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
-chat_id = os.getenv('TELEGRAM_CHAT_ID')
+youtube_api_key = _settings.youtube_api_key
+gemini_api_key = _settings.gemini_api_key
+bot_token = _settings.bot_token
+chat_id = _settings.chat_id
 
 # Channels to monitor
 youtube_channels = [
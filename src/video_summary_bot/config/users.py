@@ -3,17 +3,22 @@
 Note: Update with actual user IDs and preferences and run migration script to move to DB
 """
 
+# Every user currently subscribes to the same channels; one shared tuple
+# instead of a fresh list per user keeps a single copy in memory
+DEFAULT_CHANNELS = ('@TechNewsDaily', '@FinanceInsights', '@CryptoAnalysis',
+                    '@MarketWatch', '@InvestmentTips')
+
 user_preferences = {
     '12345678': {  # John Smith
-        'channels': ["@TechNewsDaily", '@FinanceInsights', '@CryptoAnalysis', '@MarketWatch', '@InvestmentTips'],
+        'channels': DEFAULT_CHANNELS,
         'user_name': 'John Smith'
     },
     '23456789': {  # Sarah Johnson
-        'channels': ['@TechNewsDaily', '@FinanceInsights', '@CryptoAnalysis', '@MarketWatch', '@InvestmentTips'],
+        'channels': DEFAULT_CHANNELS,
         'user_name': 'Sarah Johnson'
     },
     '34567890': {  # Michael Brown
-        'channels': ['@TechNewsDaily', '@FinanceInsights', '@CryptoAnalysis', '@MarketWatch', '@InvestmentTips'],
+        'channels': DEFAULT_CHANNELS,
         'user_name': 'Michael Brown'
     }
-}
\ No newline at end of file
+}
@@ -2,15 +2,20 @@
 
 import os
 import logging
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
 def get_database():
     """
     Factory function to get the appropriate database instance
 
-    Automatically chooses between PostgreSQL (Supabase) and SQLite based on environment
+    Automatically chooses between PostgreSQL (Supabase) and SQLite based on environment.
+    The instance is cached, so every entry point in the process shares
+    one database object (and its connection pool) instead of each
+    building its own.
 
     Returns:
         Database instance (either PostgresDatabase or Database/SQLite)
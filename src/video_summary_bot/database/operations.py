@@ -1,35 +1,128 @@
 import sqlite3
 import logging
-from datetime import datetime
+import threading
+import time
+from collections import OrderedDict
 from typing import Optional, List, Dict, Any
 from contextlib import contextmanager
 
+from video_summary_bot.utils.dates import today_str
+
 logger = logging.getLogger(__name__)
 
+# Flags are stored as INTEGER; picking between two constants avoids an
+# int() call per bound parameter on the write paths
+_TRUE, _FALSE = 1, 0
+
+
+# Hot-path SQL hoisted to module constants: the sqlite3 statement cache
+# is keyed by the query string, so reusing the same object guarantees a
+# hit and skips re-compiling to VDBE bytecode on every poll tick
+_SQL_ADD_SUMMARY = '''
+    INSERT INTO summaries
+    (channel_handle, video_id, video_title, video_url, summary_text, video_date, success)
+    VALUES (:channel_handle, :video_id, :video_title, :video_url, :summary_text, :video_date, :success)
+    ON CONFLICT(video_id) WHERE success = 1 DO NOTHING
+'''
+# Fallback for databases where the partial unique index could not be
+# created: an ON CONFLICT clause without its backing index is an error
+# in SQLite, not a no-op, so the conflict clause must be dropped entirely
+_SQL_ADD_SUMMARY_PLAIN = '''
+    INSERT INTO summaries
+    (channel_handle, video_id, video_title, video_url, summary_text, video_date, success)
+    VALUES (:channel_handle, :video_id, :video_title, :video_url, :summary_text, :video_date, :success)
+'''
+_SQL_HAS_CHANNEL_DATE = '''
+    SELECT 1 FROM summaries
+    WHERE channel_handle = ? AND video_date = ? AND success = 1
+    LIMIT 1
+'''
+_SQL_GET_SUMMARY_BY_VIDEO_ID = '''
+    SELECT * FROM summaries
+    WHERE video_id = ? AND success = 1
+    ORDER BY processed_at DESC
+    LIMIT 1
+'''
+_SQL_HAS_VIDEO_ID = '''
+    SELECT 1 FROM summaries
+    WHERE video_id = ? AND success = 1
+    LIMIT 1
+'''
+
 class Database:
+    # Bump when init_database's DDL changes; a database already at this
+    # version skips the whole DDL pass on construction
+    _SCHEMA_VERSION = 1
+
+    # The RSS poller re-asks about the same recent video ids every tick;
+    # even an index probe loses to a dict hit, so both hot lookups keep a
+    # small in-process cache invalidated/updated by add_summary
+    _PROCESSED_CACHE_SIZE = 4096
+    _SUMMARY_ROW_TTL = 600
+
     def __init__(self, db_path: str = "data/video_summary.db"):
         self.db_path = db_path
+        # One long-lived connection instead of open-per-call: SQLite's
+        # per-connection page cache survives between queries and the
+        # WAL/SHM files aren't re-mapped on every method. The lock
+        # serializes access from the listener and scheduler threads.
+        self._lock = threading.RLock()
+        # cached_statements keeps compiled statements for reuse; 256
+        # comfortably covers every distinct query in this module
+        self._conn = sqlite3.connect(
+            db_path, check_same_thread=False, cached_statements=256
+        )
+        self._conn.row_factory = sqlite3.Row
+        # Connection tuning, applied once since the connection is shared:
+        # WAL lets readers and the writer run concurrently; NORMAL skips
+        # the fsync-per-transaction that FULL pays (safe under WAL);
+        # temp_store/cache_size keep sorts and hot pages in memory; mmap
+        # serves reads straight from the page cache without a pager copy
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('PRAGMA temp_store=MEMORY')
+        self._conn.execute('PRAGMA cache_size=-64000')
+        self._conn.execute('PRAGMA mmap_size=268435456')
+        self._conn.execute('PRAGMA foreign_keys=ON')
+        self._processed_ids = OrderedDict()
+        self._summary_rows = OrderedDict()
         self.init_database()
 
+    def _cache_put(self, cache: OrderedDict, key: str, value):
+        """Insert into a bounded LRU cache (caller holds self._lock)"""
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > self._PROCESSED_CACHE_SIZE:
+            cache.popitem(last=False)
+
     @contextmanager
     def get_connection(self):
-        """Context manager for database connections"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-            conn.commit()
-        except Exception as e:
-            conn.rollback()
-            raise e
-        finally:
-            conn.close()
+        """Context manager yielding the shared connection under its lock"""
+        with self._lock:
+            try:
+                yield self._conn
+                self._conn.commit()
+            except Exception as e:
+                self._conn.rollback()
+                raise e
+
+    def close(self):
+        """Close the shared connection"""
+        self._conn.close()
 
     def init_database(self):
-        """Initialize database schema"""
+        """Initialize database schema (skipped when already current)"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
 
+            # An already-migrated database answers with one pragma read
+            # instead of re-running ten DDL statements per construction
+            cursor.execute('PRAGMA user_version')
+            if cursor.fetchone()[0] == self._SCHEMA_VERSION:
+                self._has_unique_success_index = \
+                    self._unique_success_index_exists(cursor)
+                return
+
             # Users table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS users (
@@ -87,10 +180,71 @@ class Database:
 
             # Create indexes
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_summaries_date ON summaries(video_date)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_summaries_channel ON summaries(channel_handle)')
-
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_summaries_video_id ON summaries(video_id)')
+            # Covers the (channel_handle, video_date, success) existence
+            # probe with a single index lookup; subsumes the old
+            # single-column channel_handle index, which is dropped
+            cursor.execute(
+                'CREATE INDEX IF NOT EXISTS idx_summaries_chan_date_ok '
+                'ON summaries(channel_handle, video_date, success)'
+            )
+            cursor.execute('DROP INDEX IF EXISTS idx_summaries_channel')
+            # Duplicate successes are rejected by the schema itself, so
+            # writers need no pre-check query. A database that already
+            # holds duplicate successful rows would refuse the index, so
+            # keep only the newest row per video id first; NULL ids stay
+            # untouched because the partial index never constrains them.
+            # The delete and the CREATE share a savepoint, so a failed
+            # CREATE rolls the deletion back too instead of the outer
+            # commit keeping the data loss without the constraint.
+            cursor.execute('SAVEPOINT dedupe_successes')
+            try:
+                cursor.execute('''
+                    DELETE FROM summaries
+                    WHERE success = 1 AND video_id IS NOT NULL
+                      AND summary_id NOT IN (
+                          SELECT MAX(summary_id) FROM summaries
+                          WHERE success = 1 AND video_id IS NOT NULL
+                          GROUP BY video_id
+                      )
+                ''')
+                cursor.execute(
+                    'CREATE UNIQUE INDEX IF NOT EXISTS uq_summaries_video_id '
+                    'ON summaries(video_id) WHERE success = 1'
+                )
+                cursor.execute('RELEASE SAVEPOINT dedupe_successes')
+            except sqlite3.Error as e:
+                cursor.execute('ROLLBACK TO SAVEPOINT dedupe_successes')
+                cursor.execute('RELEASE SAVEPOINT dedupe_successes')
+                logger.warning(f"Could not create uq_summaries_video_id: {e}")
+
+            # Lets the due-channels window probe skip inactive/out-of-window
+            # rows without touching the table
+            cursor.execute(
+                'CREATE INDEX IF NOT EXISTS idx_channels_active_window '
+                'ON channels(active, check_start_hour, check_end_hour)'
+            )
+
+            # Writers pick their INSERT based on what actually exists: ON
+            # CONFLICT against a missing index raises in SQLite rather
+            # than degrading to a plain insert
+            self._has_unique_success_index = \
+                self._unique_success_index_exists(cursor)
+            if self._has_unique_success_index:
+                # Only a fully-built schema is recorded; a failed index
+                # leaves the version behind so the DDL retries next time
+                cursor.execute(f'PRAGMA user_version = {self._SCHEMA_VERSION}')
             logger.info("Database initialized successfully")
 
+    @staticmethod
+    def _unique_success_index_exists(cursor) -> bool:
+        """Whether the partial unique index on successful summaries exists"""
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' "
+            "AND name = 'uq_summaries_video_id'"
+        )
+        return cursor.fetchone() is not None
+
     # User operations
     def add_user(self, user_id: str, username: str = None, active: bool = True):
         """Add or update a user"""
@@ -103,7 +257,7 @@ class Database:
                     username = excluded.username,
                     active = excluded.active,
                     updated_at = CURRENT_TIMESTAMP
-            ''', (user_id, username, int(active)))
+            ''', (user_id, username, _TRUE if active else _FALSE))
             logger.info(f"User {user_id} added/updated")
 
     def get_user(self, user_id: str) -> Optional[Dict[str, Any]]:
@@ -124,6 +278,30 @@ class Database:
                 cursor.execute('SELECT * FROM users')
             return [dict(row) for row in cursor.fetchall()]
 
+    def get_active_user_ids(self) -> set:
+        """Get just the IDs of active users
+
+        Cheaper than get_all_users when only membership matters (e.g.
+        the listener's periodic authorization refresh).
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT user_id FROM users WHERE active = 1')
+            return {row['user_id'] for row in cursor.fetchall()}
+
+    def add_users_bulk(self, rows: List[tuple]):
+        """Insert many users in a single transaction
+
+        Each row is (user_id, username, active).
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany('''
+                INSERT OR IGNORE INTO users (user_id, username, active)
+                VALUES (?, ?, ?)
+            ''', rows)
+            logger.info(f"{len(rows)} users added")
+
     def is_user_authorized(self, user_id: str) -> bool:
         """Check if user is authorized (exists and is active)"""
         with self.get_connection() as conn:
@@ -156,6 +334,35 @@ class Database:
                   check_start_minute, check_end_hour, check_interval_minutes))
             logger.info(f"Channel {channel_handle} added")
 
+    def add_channels_bulk(self, rows: List[tuple]):
+        """Insert many channels in a single transaction
+
+        Each row is (channel_handle, channel_name, youtube_channel_id, language,
+        check_start_hour, check_start_minute, check_end_hour, check_interval_minutes).
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany('''
+                INSERT OR IGNORE INTO channels
+                (channel_handle, channel_name, youtube_channel_id, language, check_start_hour,
+                 check_start_minute, check_end_hour, check_interval_minutes)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+            logger.info(f"{len(rows)} channels added")
+
+    def get_or_create_channel(self, channel_handle: str, channel_name: str = None) -> int:
+        """Get a channel's id, creating the channel if missing, in one statement"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO channels (channel_handle, channel_name)
+                VALUES (?, ?)
+                ON CONFLICT(channel_handle) DO UPDATE SET
+                    channel_handle = excluded.channel_handle
+                RETURNING channel_id
+            ''', (channel_handle, channel_name))
+            return cursor.fetchone()['channel_id']
+
     def get_channel(self, channel_handle: str) -> Optional[Dict[str, Any]]:
         """Get channel by handle"""
         with self.get_connection() as conn:
@@ -164,6 +371,17 @@ class Database:
             row = cursor.fetchone()
             return dict(row) if row else None
 
+    def get_active_channel_handles(self) -> List[str]:
+        """Get just the handles of active channels
+
+        The scheduler only needs handles to drive processing; projecting
+        one column skips building a full dict per channel row.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT channel_handle FROM channels WHERE active = 1')
+            return [row['channel_handle'] for row in cursor.fetchall()]
+
     def get_all_channels(self, active_only: bool = True) -> List[Dict[str, Any]]:
         """Get all channels"""
         with self.get_connection() as conn:
@@ -174,33 +392,90 @@ class Database:
             cursor.execute(query)
             return [dict(row) for row in cursor.fetchall()]
 
+    def get_due_channels(self, now_minutes: int, date: str) -> List[Dict[str, Any]]:
+        """Get channels worth processing right now, with their subscribers
+
+        A channel is due when it is active, the current minute-of-day falls
+        inside its check window, it has at least one active subscriber, and
+        no successful summary exists yet for the given date. Subscriber ids
+        come back in a 'subscribers' list, so a scheduler tick needs no
+        further queries.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT c.*, GROUP_CONCAT(u.user_id) AS subscriber_ids
+                FROM channels c
+                INNER JOIN user_channels uc ON c.channel_id = uc.channel_id
+                INNER JOIN users u ON uc.user_id = u.user_id AND u.active = 1
+                WHERE c.active = 1
+                  AND ? >= c.check_start_hour * 60 + c.check_start_minute
+                  AND ? < c.check_end_hour * 60
+                  AND NOT EXISTS (
+                      SELECT 1 FROM summaries s
+                      WHERE s.channel_handle = c.channel_handle
+                        AND s.video_date = ? AND s.success = 1
+                  )
+                GROUP BY c.channel_id
+            ''', (now_minutes, now_minutes, date))
+
+            channels = []
+            for row in cursor.fetchall():
+                channel = dict(row)
+                channel['subscribers'] = channel.pop('subscriber_ids').split(',')
+                channels.append(channel)
+            return channels
+
     # Subscription operations
     def subscribe_user_to_channel(self, user_id: str, channel_handle: str):
         """Subscribe a user to a channel"""
-        channel = self.get_channel(channel_handle)
-        if not channel:
-            raise ValueError(f"Channel {channel_handle} not found")
-
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            # One statement resolves the handle and inserts; the separate
+            # get_channel round-trip only existed to fetch channel_id
             cursor.execute('''
                 INSERT OR IGNORE INTO user_channels (user_id, channel_id)
-                VALUES (?, ?)
-            ''', (user_id, channel['channel_id']))
+                SELECT ?, channel_id FROM channels WHERE channel_handle = ?
+            ''', (user_id, channel_handle))
+            if cursor.rowcount == 0:
+                # Nothing inserted: unknown handle or already subscribed;
+                # only the former is an error
+                cursor.execute('SELECT 1 FROM channels WHERE channel_handle = ? LIMIT 1',
+                               (channel_handle,))
+                if cursor.fetchone() is None:
+                    raise ValueError(f"Channel {channel_handle} not found")
             logger.info(f"User {user_id} subscribed to {channel_handle}")
 
+    def add_subscriptions_bulk(self, rows: List[tuple]):
+        """Insert many subscriptions in a single transaction
+
+        Each row is (user_id, channel_handle); handles are resolved to
+        channel ids inside the statement, unknown handles are skipped.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany('''
+                INSERT OR IGNORE INTO user_channels (user_id, channel_id)
+                SELECT ?, channel_id FROM channels WHERE channel_handle = ?
+            ''', rows)
+            logger.info(f"{len(rows)} subscriptions added")
+
     def unsubscribe_user_from_channel(self, user_id: str, channel_handle: str):
         """Unsubscribe a user from a channel"""
-        channel = self.get_channel(channel_handle)
-        if not channel:
-            raise ValueError(f"Channel {channel_handle} not found")
-
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 DELETE FROM user_channels
-                WHERE user_id = ? AND channel_id = ?
-            ''', (user_id, channel['channel_id']))
+                WHERE user_id = ?
+                  AND channel_id = (SELECT channel_id FROM channels WHERE channel_handle = ?)
+            ''', (user_id, channel_handle))
+            if cursor.rowcount == 0:
+                # Nothing deleted: unknown handle or was not subscribed;
+                # only the former is an error
+                cursor.execute('SELECT 1 FROM channels WHERE channel_handle = ? LIMIT 1',
+                               (channel_handle,))
+                if cursor.fetchone() is None:
+                    raise ValueError(f"Channel {channel_handle} not found")
             logger.info(f"User {user_id} unsubscribed from {channel_handle}")
 
     def get_user_channels(self, user_id: str) -> List[Dict[str, Any]]:
@@ -226,36 +501,91 @@ class Database:
             ''', (channel_handle,))
             return [row['user_id'] for row in cursor.fetchall()]
 
+    def get_channel_subscribers_map(self) -> Dict[str, List[str]]:
+        """Get subscribers for every active channel in one query
+
+        Returns:
+            Dict mapping channel_handle to its list of active user IDs
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT c.channel_handle, GROUP_CONCAT(u.user_id) AS subscriber_ids
+                FROM channels c
+                INNER JOIN user_channels uc ON c.channel_id = uc.channel_id
+                INNER JOIN users u ON uc.user_id = u.user_id AND u.active = 1
+                WHERE c.active = 1
+                GROUP BY c.channel_handle
+            ''')
+            return {
+                row['channel_handle']: row['subscriber_ids'].split(',')
+                for row in cursor.fetchall()
+            }
+
     # Summary operations
     def add_summary(self, channel_handle: str, video_id: str, video_title: str,
                    video_url: str, summary_text: str, video_date: str = None,
-                   success: bool = True):
-        """Log a video summary"""
-        if video_date is None:
-            video_date = datetime.now().strftime('%Y-%m-%d')
+                   success: bool = True) -> bool:
+        """Log a video summary
 
+        Returns:
+            True if the row was inserted, False if a successful summary
+            for this video already existed (schema-level dedup)
+        """
+        if video_date is None:
+            video_date = today_str()
+
+        inserted = self.add_summaries([{
+            'channel_handle': channel_handle, 'video_id': video_id,
+            'video_title': video_title, 'video_url': video_url,
+            'summary_text': summary_text, 'video_date': video_date,
+            'success': _TRUE if success else _FALSE
+        }]) > 0
+        logger.info(f"Summary logged for {channel_handle}: {video_title}")
+        return inserted
+
+    def add_summaries(self, rows: List[Dict[str, Any]]) -> int:
+        """Log many video summaries in one transaction
+
+        Each row is a dict with channel_handle, video_id, video_title,
+        video_url, summary_text, video_date and success. The whole batch
+        shares one commit, so the fsync cost is paid once instead of per
+        row when a tick discovers several new videos. Duplicate
+        successful summaries are dropped by the unique video_id index
+        instead of a pre-check query; on a database where that index
+        could not be created, rows are inserted without deduplication.
+
+        Returns:
+            Number of rows actually inserted
+        """
+        if not rows:
+            return 0
+
+        statement = (_SQL_ADD_SUMMARY if self._has_unique_success_index
+                     else _SQL_ADD_SUMMARY_PLAIN)
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO summaries
-                (channel_handle, video_id, video_title, video_url, summary_text, video_date, success)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (channel_handle, video_id, video_title, video_url, summary_text, video_date, int(success)))
-            logger.info(f"Summary logged for {channel_handle}: {video_title}")
+            cursor.executemany(statement, rows)
+            inserted = cursor.rowcount
+            # Keep the lookup caches coherent: a skip still means a
+            # successful row exists for that id
+            for row in rows:
+                if row['success'] and row['video_id']:
+                    self._cache_put(self._processed_ids, row['video_id'], True)
+                    self._summary_rows.pop(row['video_id'], None)
+            return inserted
 
     def has_video_been_processed(self, channel_handle: str, date: str = None) -> bool:
         """Check if a video from a channel has been processed today"""
         if date is None:
-            date = datetime.now().strftime('%Y-%m-%d')
+            date = today_str()
 
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                SELECT COUNT(*) as count FROM summaries
-                WHERE channel_handle = ? AND video_date = ? AND success = 1
-            ''', (channel_handle, date))
-            result = cursor.fetchone()
-            return result['count'] > 0
+            # LIMIT 1 stops at the first index hit instead of counting
+            # every historical success for the key
+            cursor.execute(_SQL_HAS_CHANNEL_DATE, (channel_handle, date))
+            return cursor.fetchone() is not None
 
     def get_summaries(self, channel_handle: str = None, date: str = None,
                      limit: int = 10) -> List[Dict[str, Any]]:
@@ -280,25 +610,37 @@ class Database:
             return [dict(row) for row in cursor.fetchall()]
 
     def get_summary_by_video_id(self, video_id: str) -> Optional[Dict[str, Any]]:
-        """Get summary for a specific video ID if it exists"""
+        """Get summary for a specific video ID if it exists (cached ~10 min)"""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._summary_rows.get(video_id)
+            if cached is not None and cached[1] > now:
+                self._summary_rows.move_to_end(video_id)
+                return cached[0]
+
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                SELECT * FROM summaries
-                WHERE video_id = ? AND success = 1
-                ORDER BY processed_at DESC
-                LIMIT 1
-            ''', (video_id,))
+            cursor.execute(_SQL_GET_SUMMARY_BY_VIDEO_ID, (video_id,))
             result = cursor.fetchone()
-            return dict(result) if result else None
+            row = dict(result) if result else None
+            if row is not None:
+                self._cache_put(self._summary_rows, video_id,
+                                (row, now + self._SUMMARY_ROW_TTL))
+            return row
 
     def has_video_id_been_processed(self, video_id: str) -> bool:
         """Check if a specific video ID has been processed"""
+        with self._lock:
+            cached = self._processed_ids.get(video_id)
+            if cached is not None:
+                self._processed_ids.move_to_end(video_id)
+                return cached
+
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                SELECT COUNT(*) as count FROM summaries
-                WHERE video_id = ? AND success = 1
-            ''', (video_id,))
-            result = cursor.fetchone()
-            return result['count'] > 0
\ No newline at end of file
+            cursor.execute(_SQL_HAS_VIDEO_ID, (video_id,))
+            processed = cursor.fetchone() is not None
+            # Negatives are safe to remember too: add_summary overwrites
+            # the entry when the video is eventually processed
+            self._cache_put(self._processed_ids, video_id, processed)
+            return processed
\ No newline at end of file
@@ -1,19 +1,85 @@
 """PostgreSQL database operations using SQLAlchemy"""
 
+import csv
+import io
 import logging
 import os
-from datetime import datetime
+import threading
+import time
+from collections import OrderedDict
 from typing import Optional, List, Dict, Any
 from contextlib import contextmanager
 from sqlalchemy import create_engine, text, pool
 from sqlalchemy.orm import sessionmaker, scoped_session
 
+from video_summary_bot.utils.dates import today_str
+
 logger = logging.getLogger(__name__)
 
+# Flags are stored as INTEGER; picking between two constants avoids an
+# int() call per bound parameter on the write paths
+_TRUE, _FALSE = 1, 0
+
+
+# Hot-path statements built once at import: reusing the same TextClause
+# object skips re-constructing it per call and guarantees hits in
+# SQLAlchemy's compiled-statement cache
+# Summary inserts go through psycopg2's execute_values (%s is the
+# placeholder it fills with the batch); RETURNING 1 yields a row per
+# insert actually performed, because the driver's rowcount only covers
+# the last page of an executemany batch
+_SQL_ADD_SUMMARY = '''
+    INSERT INTO summaries
+    (channel_handle, video_id, video_title, video_url, summary_text, video_date, success)
+    VALUES %s
+    ON CONFLICT (video_id) WHERE success = 1 DO NOTHING
+    RETURNING 1
+'''
+# Fallback for databases where the partial unique index could not be
+# created: an ON CONFLICT clause without a matching index is an error in
+# PostgreSQL, not a no-op, so the conflict clause must be dropped entirely
+_SQL_ADD_SUMMARY_PLAIN = '''
+    INSERT INTO summaries
+    (channel_handle, video_id, video_title, video_url, summary_text, video_date, success)
+    VALUES %s
+    RETURNING 1
+'''
+_SQL_GET_SUMMARY_BY_VIDEO_ID = text('''
+    SELECT * FROM summaries
+    WHERE video_id = :video_id AND success = 1
+    ORDER BY processed_at DESC
+    LIMIT 1
+''')
+_SQL_HAS_VIDEO_ID = text('''
+    SELECT 1 FROM summaries
+    WHERE video_id = :video_id AND success = 1
+    LIMIT 1
+''')
+_SQL_HAS_CHANNEL_DATE = text('''
+    SELECT 1 FROM summaries
+    WHERE channel_handle = :handle AND video_date = :date AND success = 1
+    LIMIT 1
+''')
+_SQL_IS_USER_AUTHORIZED = text('''
+    SELECT 1 FROM users
+    WHERE user_id = :user_id AND active = 1
+    LIMIT 1
+''')
+
 
 class PostgresDatabase:
     """PostgreSQL database handler using SQLAlchemy"""
 
+    # Bump when init_database's DDL changes; a database already at this
+    # version skips the whole DDL pass on construction
+    _SCHEMA_VERSION = 1
+
+    # The RSS poller re-asks about the same recent video ids every tick;
+    # even an index probe loses to a dict hit, so both hot lookups keep a
+    # small in-process cache invalidated/updated by add_summary
+    _PROCESSED_CACHE_SIZE = 4096
+    _SUMMARY_ROW_TTL = 600
+
     def __init__(self, database_url: str = None):
         """Initialize PostgreSQL connection"""
         self.database_url = database_url or os.getenv('DATABASE_URL')
@@ -21,22 +87,46 @@ class PostgresDatabase:
         if not self.database_url:
             raise ValueError("DATABASE_URL environment variable not set")
 
-        # Create engine with connection pooling
+        # Create engine with connection pooling. pre_ping would add a
+        # SELECT 1 round trip before every checkout — doubling the cost
+        # of the one-row probes — so stale connections are handled by
+        # recycling them after 30 minutes instead.
         self.engine = create_engine(
             self.database_url,
             poolclass=pool.QueuePool,
-            pool_size=5,
+            pool_size=max(os.cpu_count() or 4, 4),
             max_overflow=10,
-            pool_pre_ping=True,  # Verify connections before using
+            pool_pre_ping=False,
+            pool_recycle=1800,
+            # Route executemany through psycopg2's execute_values
+            # (multi-row VALUES) and batch other statement types too
+            executemany_mode='values_plus_batch',
             echo=False  # Set to True for SQL debugging
         )
 
         # Create session factory
         self.Session = scoped_session(sessionmaker(bind=self.engine))
 
+        # Shares the pool but skips transaction begin/commit: one-row
+        # probes don't need the bookkeeping
+        self._autocommit_engine = self.engine.execution_options(
+            isolation_level='AUTOCOMMIT'
+        )
+
+        self._cache_lock = threading.Lock()
+        self._processed_ids = OrderedDict()
+        self._summary_rows = OrderedDict()
+
         # Initialize schema
         self.init_database()
 
+    def _cache_put(self, cache: OrderedDict, key: str, value):
+        """Insert into a bounded LRU cache (caller holds self._cache_lock)"""
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > self._PROCESSED_CACHE_SIZE:
+            cache.popitem(last=False)
+
     @contextmanager
     def get_session(self):
         """Context manager for database sessions"""
@@ -50,8 +140,48 @@ class PostgresDatabase:
         finally:
             session.close()
 
+    @contextmanager
+    def raw_connection(self):
+        """Context manager for raw DBAPI connections from the pool
+
+        Bypasses the session layer for bulk paths (COPY, execute_values)
+        where per-call wrapper overhead matters. Commits on success and
+        rolls back on error, like get_session.
+        """
+        conn = self.engine.raw_connection()
+        try:
+            yield conn
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise e
+        finally:
+            conn.close()
+
+    def _read_scalar(self, statement, params):
+        """Run a read-only single-value lookup without session overhead
+
+        Goes straight to an AUTOCOMMIT connection from the pool, so the
+        probe pays neither ORM session setup nor the BEGIN/COMMIT round
+        trips a one-row read doesn't need.
+        """
+        with self._autocommit_engine.connect() as conn:
+            return conn.execute(statement, params).scalar()
+
     def init_database(self):
-        """Initialize database schema"""
+        """Initialize database schema (skipped when already current)"""
+        # An already-migrated database answers with one scalar read
+        # instead of re-running the DDL pass per construction
+        try:
+            with self.engine.connect() as conn:
+                current = conn.execute(text('SELECT version FROM schema_version')).scalar()
+            if current == self._SCHEMA_VERSION:
+                self._has_unique_success_index = self._unique_success_index_exists()
+                return
+        except Exception:
+            # First run: the version table doesn't exist yet
+            pass
+
         with self.engine.connect() as conn:
             # Users table
             conn.execute(text('''
@@ -110,25 +240,91 @@ class PostgresDatabase:
 
             # Create indexes
             conn.execute(text('CREATE INDEX IF NOT EXISTS idx_summaries_date ON summaries(video_date)'))
-            conn.execute(text('CREATE INDEX IF NOT EXISTS idx_summaries_channel ON summaries(channel_handle)'))
             conn.execute(text('CREATE INDEX IF NOT EXISTS idx_summaries_video_id ON summaries(video_id)'))
+            # Covers the (channel_handle, video_date, success) existence
+            # probe with a single index lookup; subsumes the old
+            # single-column channel_handle index, which is dropped
+            conn.execute(text(
+                'CREATE INDEX IF NOT EXISTS idx_summaries_chan_date_ok '
+                'ON summaries(channel_handle, video_date, success)'
+            ))
+            conn.execute(text('DROP INDEX IF EXISTS idx_summaries_channel'))
+            # Lets the due-channels window probe skip inactive/out-of-window
+            # rows without touching the table
+            conn.execute(text(
+                'CREATE INDEX IF NOT EXISTS idx_channels_active_window '
+                'ON channels(active, check_start_hour, check_end_hour)'
+            ))
 
             conn.commit()
-            logger.info("PostgreSQL database initialized successfully")
+
+        # Duplicate successes are rejected by the schema itself, so
+        # writers need no pre-check query. A database that already holds
+        # duplicate successful rows would refuse the index, so keep only
+        # the newest row per video id in the same transaction — a failed
+        # CREATE then rolls the deletion back too. NULL ids stay
+        # untouched because the partial index never constrains them.
+        try:
+            with self.engine.connect() as conn:
+                conn.execute(text('''
+                    DELETE FROM summaries
+                    WHERE success = 1 AND video_id IS NOT NULL
+                      AND summary_id NOT IN (
+                          SELECT MAX(summary_id) FROM summaries
+                          WHERE success = 1 AND video_id IS NOT NULL
+                          GROUP BY video_id
+                      )
+                '''))
+                conn.execute(text(
+                    'CREATE UNIQUE INDEX IF NOT EXISTS uq_summaries_video_id '
+                    'ON summaries(video_id) WHERE success = 1'
+                ))
+                conn.commit()
+        except Exception as e:
+            logger.warning(f"Could not create uq_summaries_video_id: {e}")
+
+        # Writers pick their INSERT based on what actually exists: ON
+        # CONFLICT against a missing index raises in PostgreSQL rather
+        # than degrading to a plain insert
+        self._has_unique_success_index = self._unique_success_index_exists()
+
+        if self._has_unique_success_index:
+            # Record the version last, and only for a fully-built schema;
+            # a partial failure above retries the DDL on the next
+            # construction
+            with self.engine.connect() as conn:
+                conn.execute(text(
+                    'CREATE TABLE IF NOT EXISTS schema_version (version INTEGER PRIMARY KEY)'
+                ))
+                conn.execute(text('DELETE FROM schema_version'))
+                conn.execute(text('INSERT INTO schema_version (version) VALUES (:v)'),
+                             {'v': self._SCHEMA_VERSION})
+                conn.commit()
+
+        logger.info("PostgreSQL database initialized successfully")
+
+    def _unique_success_index_exists(self) -> bool:
+        """Whether the partial unique index on successful summaries exists"""
+        return self._read_scalar(text(
+            "SELECT 1 FROM pg_indexes WHERE indexname = 'uq_summaries_video_id'"
+        ), {}) is not None
 
     # User operations
-    def add_user(self, user_id: str, username: str = None, active: bool = True):
-        """Add or update a user"""
+    def add_user(self, user_id: str, username: str = None, active: bool = True) -> str:
+        """Add or update a user, returning its id in the same round trip"""
         with self.get_session() as session:
-            session.execute(text('''
+            result = session.execute(text('''
                 INSERT INTO users (user_id, username, active)
                 VALUES (:user_id, :username, :active)
                 ON CONFLICT(user_id) DO UPDATE SET
                     username = EXCLUDED.username,
                     active = EXCLUDED.active,
                     updated_at = CURRENT_TIMESTAMP
-            '''), {'user_id': user_id, 'username': username, 'active': int(active)})
+                RETURNING user_id
+            '''), {'user_id': user_id, 'username': username,
+                   'active': _TRUE if active else _FALSE}).fetchone()
             logger.info(f"User {user_id} added/updated")
+            return result[0]
 
     def get_user(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Get user by ID"""
@@ -148,14 +344,35 @@ class PostgresDatabase:
                 result = session.execute(text('SELECT * FROM users'))
             return [dict(row._mapping) for row in result]
 
+    def get_active_user_ids(self) -> set:
+        """Get just the IDs of active users
+
+        Cheaper than get_all_users when only membership matters (e.g.
+        the listener's periodic authorization refresh).
+        """
+        with self.get_session() as session:
+            result = session.execute(text('SELECT user_id FROM users WHERE active = 1'))
+            return {row[0] for row in result}
+
+    def get_migration_counts(self) -> tuple:
+        """Row counts for users, channels and summaries in one query
+
+        Returns only three scalars over the wire, instead of transferring
+        whole tables just to take len() of them.
+        """
+        with self.get_session() as session:
+            result = session.execute(text('''
+                SELECT (SELECT COUNT(*) FROM users),
+                       (SELECT COUNT(*) FROM channels),
+                       (SELECT COUNT(*) FROM summaries)
+            ''')).fetchone()
+            return result[0], result[1], result[2]
+
     def is_user_authorized(self, user_id: str) -> bool:
         """Check if user is authorized (exists and is active)"""
-        with self.get_session() as session:
-            result = session.execute(
-                text('SELECT COUNT(*) as count FROM users WHERE user_id = :user_id AND active = 1'),
-                {'user_id': user_id}
-            ).fetchone()
-            return result[0] > 0
+        return self._read_scalar(
+            _SQL_IS_USER_AUTHORIZED, {'user_id': user_id}
+        ) is not None
 
     def deactivate_user(self, user_id: str):
         """Deactivate a user (soft delete)"""
@@ -170,21 +387,105 @@ class PostgresDatabase:
     def add_channel(self, channel_handle: str, channel_name: str = None,
                    youtube_channel_id: str = None, language: str = 'es',
                    check_start_hour: int = 10, check_start_minute: int = 0,
-                   check_end_hour: int = 14, check_interval_minutes: int = 5):
-        """Add a new channel"""
+                   check_end_hour: int = 14, check_interval_minutes: int = 5) -> int:
+        """Add a new channel, returning its id in the same round trip
+
+        The no-op DO UPDATE (instead of DO NOTHING) keeps the RETURNING
+        clause firing on conflict, so callers never need a follow-up
+        get_channel just for the id. Existing rows are not modified
+        beyond reasserting their handle.
+        """
         with self.get_session() as session:
-            session.execute(text('''
+            result = session.execute(text('''
                 INSERT INTO channels
                 (channel_handle, channel_name, youtube_channel_id, language, check_start_hour,
                  check_start_minute, check_end_hour, check_interval_minutes)
                 VALUES (:handle, :name, :yt_id, :lang, :start_h, :start_m, :end_h, :interval)
-                ON CONFLICT(channel_handle) DO NOTHING
+                ON CONFLICT(channel_handle) DO UPDATE SET
+                    channel_handle = EXCLUDED.channel_handle
+                RETURNING channel_id
             '''), {
                 'handle': channel_handle, 'name': channel_name, 'yt_id': youtube_channel_id,
                 'lang': language, 'start_h': check_start_hour, 'start_m': check_start_minute,
                 'end_h': check_end_hour, 'interval': check_interval_minutes
-            })
+            }).fetchone()
             logger.info(f"Channel {channel_handle} added")
+            return result[0]
+
+    def add_channels_bulk(self, rows: List[tuple]) -> int:
+        """Insert many channels with a single INSERT-from-unnest statement
+
+        Each row is (channel_handle, channel_name, youtube_channel_id,
+        language, check_start_hour, check_start_minute, check_end_hour,
+        check_interval_minutes). Columns travel as arrays, so the planner
+        sees one row shape no matter how wide the batch is.
+
+        Returns:
+            Number of rows submitted
+        """
+        if not rows:
+            return 0
+
+        cols = list(zip(*rows))
+        with self.get_session() as session:
+            session.execute(text('''
+                INSERT INTO channels
+                (channel_handle, channel_name, youtube_channel_id, language, check_start_hour,
+                 check_start_minute, check_end_hour, check_interval_minutes)
+                SELECT * FROM unnest(
+                    CAST(:handles AS text[]), CAST(:names AS text[]),
+                    CAST(:yt_ids AS text[]), CAST(:langs AS text[]),
+                    CAST(:start_hours AS int[]), CAST(:start_minutes AS int[]),
+                    CAST(:end_hours AS int[]), CAST(:intervals AS int[])
+                )
+                ON CONFLICT(channel_handle) DO NOTHING
+            '''), {
+                'handles': list(cols[0]), 'names': list(cols[1]),
+                'yt_ids': list(cols[2]), 'langs': list(cols[3]),
+                'start_hours': list(cols[4]), 'start_minutes': list(cols[5]),
+                'end_hours': list(cols[6]), 'intervals': list(cols[7])
+            })
+        logger.info(f"{len(rows)} channels added")
+        return len(rows)
+
+    def add_users_bulk(self, rows: List[tuple]) -> int:
+        """Insert many users with a single INSERT-from-unnest statement
+
+        Each row is (user_id, username, active).
+
+        Returns:
+            Number of rows submitted
+        """
+        if not rows:
+            return 0
+
+        cols = list(zip(*rows))
+        with self.get_session() as session:
+            session.execute(text('''
+                INSERT INTO users (user_id, username, active)
+                SELECT * FROM unnest(
+                    CAST(:user_ids AS text[]), CAST(:usernames AS text[]),
+                    CAST(:actives AS int[])
+                )
+                ON CONFLICT(user_id) DO NOTHING
+            '''), {
+                'user_ids': list(cols[0]), 'usernames': list(cols[1]),
+                'actives': list(cols[2])
+            })
+        logger.info(f"{len(rows)} users added")
+        return len(rows)
+
+    def get_or_create_channel(self, channel_handle: str, channel_name: str = None) -> int:
+        """Get a channel's id, creating the channel if missing, in one statement"""
+        with self.get_session() as session:
+            result = session.execute(text('''
+                INSERT INTO channels (channel_handle, channel_name)
+                VALUES (:handle, :name)
+                ON CONFLICT(channel_handle) DO UPDATE SET
+                    channel_handle = EXCLUDED.channel_handle
+                RETURNING channel_id
+            '''), {'handle': channel_handle, 'name': channel_name}).fetchone()
+            return result[0]
 
     def get_channel(self, channel_handle: str) -> Optional[Dict[str, Any]]:
         """Get channel by handle"""
@@ -195,6 +496,16 @@ class PostgresDatabase:
             ).fetchone()
             return dict(result._mapping) if result else None
 
+    def get_active_channel_handles(self) -> List[str]:
+        """Get just the handles of active channels
+
+        The scheduler only needs handles to drive processing; projecting
+        one column skips building a full dict per channel row.
+        """
+        with self.get_session() as session:
+            result = session.execute(text('SELECT channel_handle FROM channels WHERE active = 1'))
+            return [row[0] for row in result]
+
     def get_all_channels(self, active_only: bool = True) -> List[Dict[str, Any]]:
         """Get all channels"""
         with self.get_session() as session:
@@ -204,6 +515,39 @@ class PostgresDatabase:
                 result = session.execute(text('SELECT * FROM channels'))
             return [dict(row._mapping) for row in result]
 
+    def get_due_channels(self, now_minutes: int, date: str) -> List[Dict[str, Any]]:
+        """Get channels worth processing right now, with their subscribers
+
+        A channel is due when it is active, the current minute-of-day falls
+        inside its check window, it has at least one active subscriber, and
+        no successful summary exists yet for the given date. Subscriber ids
+        come back in a 'subscribers' list, so a scheduler tick needs no
+        further queries.
+        """
+        with self.get_session() as session:
+            result = session.execute(text('''
+                SELECT c.*, STRING_AGG(u.user_id, ',') AS subscriber_ids
+                FROM channels c
+                INNER JOIN user_channels uc ON c.channel_id = uc.channel_id
+                INNER JOIN users u ON uc.user_id = u.user_id AND u.active = 1
+                WHERE c.active = 1
+                  AND :now_minutes >= c.check_start_hour * 60 + c.check_start_minute
+                  AND :now_minutes < c.check_end_hour * 60
+                  AND NOT EXISTS (
+                      SELECT 1 FROM summaries s
+                      WHERE s.channel_handle = c.channel_handle
+                        AND s.video_date = CAST(:date AS date) AND s.success = 1
+                  )
+                GROUP BY c.channel_id
+            '''), {'now_minutes': now_minutes, 'date': date})
+
+            channels = []
+            for row in result:
+                channel = dict(row._mapping)
+                channel['subscribers'] = channel.pop('subscriber_ids').split(',')
+                channels.append(channel)
+            return channels
+
     # User-Channel subscriptions
     def subscribe_user_to_channel(self, user_id: str, channel_id: int):
         """Subscribe a user to a channel"""
@@ -215,6 +559,33 @@ class PostgresDatabase:
             '''), {'user_id': user_id, 'channel_id': channel_id})
             logger.info(f"User {user_id} subscribed to channel {channel_id}")
 
+    def add_subscriptions_bulk(self, pairs: List[tuple]) -> int:
+        """Insert many (user_id, channel_handle) subscriptions in one statement
+
+        Handles are resolved to channel ids inside the statement and
+        unknown handles are skipped — the same row shape the SQLite
+        backend takes, so callers work unchanged against either. Uses
+        psycopg2's execute_values to collapse the batch into multi-VALUES
+        pages, one round-trip per page instead of per row.
+
+        Returns:
+            Number of pairs submitted
+        """
+        from psycopg2.extras import execute_values
+
+        with self.raw_connection() as conn:
+            with conn.cursor() as cur:
+                execute_values(cur, '''
+                    INSERT INTO user_channels (user_id, channel_id)
+                    SELECT v.user_id, c.channel_id
+                    FROM (VALUES %s) AS v(user_id, channel_handle)
+                    JOIN channels c ON c.channel_handle = v.channel_handle
+                    ON CONFLICT DO NOTHING
+                ''', pairs, page_size=1000)
+
+        logger.info(f"{len(pairs)} subscriptions added")
+        return len(pairs)
+
     def get_channel_subscribers(self, channel_handle: str) -> List[str]:
         """Get list of user IDs subscribed to a channel"""
         with self.get_session() as session:
@@ -226,56 +597,177 @@ class PostgresDatabase:
             '''), {'handle': channel_handle})
             return [row[0] for row in result]
 
+    def get_channel_subscribers_map(self) -> Dict[str, List[str]]:
+        """Get subscribers for every active channel in one query
+
+        Returns:
+            Dict mapping channel_handle to its list of active user IDs
+        """
+        with self.get_session() as session:
+            result = session.execute(text('''
+                SELECT c.channel_handle, STRING_AGG(DISTINCT u.user_id, ',') AS subscriber_ids
+                FROM channels c
+                JOIN user_channels uc ON c.channel_id = uc.channel_id
+                JOIN users u ON uc.user_id = u.user_id AND u.active = 1
+                WHERE c.active = 1
+                GROUP BY c.channel_handle
+            '''))
+            return {row[0]: row[1].split(',') for row in result}
+
     # Summary operations
     def add_summary(self, channel_handle: str, video_id: str, video_title: str,
                    video_url: str, summary_text: str, video_date: str = None,
-                   success: bool = True):
-        """Log a video summary"""
-        if video_date is None:
-            video_date = datetime.now().strftime('%Y-%m-%d')
+                   success: bool = True) -> bool:
+        """Log a video summary
 
-        with self.get_session() as session:
-            session.execute(text('''
-                INSERT INTO summaries
-                (channel_handle, video_id, video_title, video_url, summary_text, video_date, success)
-                VALUES (:handle, :vid_id, :title, :url, :summary, :date, :success)
-            '''), {
-                'handle': channel_handle, 'vid_id': video_id, 'title': video_title,
-                'url': video_url, 'summary': summary_text, 'date': video_date, 'success': int(success)
-            })
-            logger.info(f"Summary logged for {channel_handle}: {video_title}")
+        Returns:
+            True if the row was inserted, False if a successful summary
+            for this video already existed (schema-level dedup)
+        """
+        if video_date is None:
+            video_date = today_str()
+
+        inserted = self.add_summaries([{
+            'channel_handle': channel_handle, 'video_id': video_id,
+            'video_title': video_title, 'video_url': video_url,
+            'summary_text': summary_text, 'video_date': video_date,
+            'success': _TRUE if success else _FALSE
+        }]) > 0
+        logger.info(f"Summary logged for {channel_handle}: {video_title}")
+        return inserted
+
+    def add_summaries(self, rows: List[Dict[str, Any]]) -> int:
+        """Log many video summaries in one transaction
+
+        Each row is a dict with channel_handle, video_id, video_title,
+        video_url, summary_text, video_date and success. execute_values
+        collapses the batch into multi-VALUES pages, one round trip per
+        page instead of per row, and RETURNING 1 counts the inserts that
+        actually happened — the driver's rowcount only reflects the last
+        page of an executemany batch. Duplicate successful summaries are
+        dropped by the unique video_id index instead of a pre-check
+        query; on a database where that index could not be created, rows
+        are inserted without deduplication.
+
+        Returns:
+            Number of rows actually inserted
+        """
+        if not rows:
+            return 0
+
+        from psycopg2.extras import execute_values
+
+        statement = (_SQL_ADD_SUMMARY if self._has_unique_success_index
+                     else _SQL_ADD_SUMMARY_PLAIN)
+        values = [
+            (row['channel_handle'], row['video_id'], row['video_title'],
+             row['video_url'], row['summary_text'], row['video_date'],
+             row['success'])
+            for row in rows
+        ]
+        with self.raw_connection() as conn:
+            with conn.cursor() as cur:
+                returned = execute_values(cur, statement, values,
+                                          page_size=1000, fetch=True)
+        inserted = len(returned)
+
+        # Keep the lookup caches coherent: a skip still means a
+        # successful row exists for that id
+        with self._cache_lock:
+            for row in rows:
+                if row['success'] and row['video_id']:
+                    self._cache_put(self._processed_ids, row['video_id'], True)
+                    self._summary_rows.pop(row['video_id'], None)
+        return inserted
+
+    def copy_summaries(self, rows_iter) -> int:
+        """Bulk load summaries with COPY FROM STDIN
+
+        Each row is (channel_handle, video_id, video_title, video_url,
+        summary_text, video_date, success). COPY streams the rows in
+        batches, skipping the per-row parse/bind cost of INSERT, and only
+        one batch of CSV is ever held in memory.
+
+        Returns:
+            Number of rows loaded
+        """
+        copy_sql = '''
+            COPY summaries
+            (channel_handle, video_id, video_title, video_url, summary_text, video_date, success)
+            FROM STDIN WITH (FORMAT CSV)
+        '''
+        batch_size = 5000
+
+        row_count = 0
+        with self.raw_connection() as conn:
+            with conn.cursor() as cur:
+                buf = io.StringIO()
+                writer = csv.writer(buf)
+                batched = 0
+                for row in rows_iter:
+                    writer.writerow(row)
+                    row_count += 1
+                    batched += 1
+                    if batched >= batch_size:
+                        buf.seek(0)
+                        cur.copy_expert(copy_sql, buf)
+                        buf = io.StringIO()
+                        writer = csv.writer(buf)
+                        batched = 0
+                if batched:
+                    buf.seek(0)
+                    cur.copy_expert(copy_sql, buf)
+
+        logger.info(f"{row_count} summaries copied")
+        return row_count
 
     def get_summary_by_video_id(self, video_id: str) -> Optional[Dict[str, Any]]:
-        """Get summary for a specific video ID if it exists"""
+        """Get summary for a specific video ID if it exists (cached ~10 min)"""
+        now = time.monotonic()
+        with self._cache_lock:
+            cached = self._summary_rows.get(video_id)
+            if cached is not None and cached[1] > now:
+                self._summary_rows.move_to_end(video_id)
+                return cached[0]
+
         with self.get_session() as session:
-            result = session.execute(text('''
-                SELECT * FROM summaries
-                WHERE video_id = :video_id AND success = 1
-                ORDER BY processed_at DESC
-                LIMIT 1
-            '''), {'video_id': video_id}).fetchone()
-            return dict(result._mapping) if result else None
+            result = session.execute(_SQL_GET_SUMMARY_BY_VIDEO_ID,
+                                     {'video_id': video_id}).fetchone()
+            row = dict(result._mapping) if result else None
+
+        if row is not None:
+            with self._cache_lock:
+                self._cache_put(self._summary_rows, video_id,
+                                (row, now + self._SUMMARY_ROW_TTL))
+        return row
 
     def has_video_id_been_processed(self, video_id: str) -> bool:
         """Check if a specific video ID has been processed"""
-        with self.get_session() as session:
-            result = session.execute(text('''
-                SELECT COUNT(*) as count FROM summaries
-                WHERE video_id = :video_id AND success = 1
-            '''), {'video_id': video_id}).fetchone()
-            return result[0] > 0
+        with self._cache_lock:
+            cached = self._processed_ids.get(video_id)
+            if cached is not None:
+                self._processed_ids.move_to_end(video_id)
+                return cached
+
+        # LIMIT 1 stops at the first index hit instead of counting
+        # every historical success for the key
+        processed = self._read_scalar(_SQL_HAS_VIDEO_ID,
+                                      {'video_id': video_id}) is not None
+
+        # Negatives are safe to remember too: add_summary overwrites the
+        # entry when the video is eventually processed
+        with self._cache_lock:
+            self._cache_put(self._processed_ids, video_id, processed)
+        return processed
 
     def has_video_been_processed(self, channel_handle: str, date: str = None) -> bool:
         """Check if a video from a channel has been processed today"""
         if date is None:
-            date = datetime.now().strftime('%Y-%m-%d')
+            date = today_str()
 
-        with self.get_session() as session:
-            result = session.execute(text('''
-                SELECT COUNT(*) as count FROM summaries
-                WHERE channel_handle = :handle AND video_date = :date AND success = 1
-            '''), {'handle': channel_handle, 'date': date}).fetchone()
-            return result[0] > 0
+        return self._read_scalar(
+            _SQL_HAS_CHANNEL_DATE, {'handle': channel_handle, 'date': date}
+        ) is not None
 
     def close(self):
         """Close database connections"""
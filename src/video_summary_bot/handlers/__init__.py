@@ -4,5 +4,15 @@ from .youtube import YouTubeHandler
 from .gemini import GeminiHandler
 from .telegram import TelegramHandler
 from .youtube_rss import YouTubeRSSHandler
+from .shared import (
+    get_youtube_handler,
+    get_gemini_handler,
+    get_telegram_handler,
+    get_rss_handler
+)
 
-__all__ = ['YouTubeHandler', 'GeminiHandler', 'TelegramHandler', 'YouTubeRSSHandler']
+__all__ = [
+    'YouTubeHandler', 'GeminiHandler', 'TelegramHandler', 'YouTubeRSSHandler',
+    'get_youtube_handler', 'get_gemini_handler', 'get_telegram_handler',
+    'get_rss_handler'
+]
@@ -2,19 +2,38 @@
 Gemini AI handler for generating summaries
 """
 
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 import google.generativeai as genai
 
 
 class GeminiHandler:
     """Handles Gemini AI operations for content summarization"""
-    
-    def __init__(self, api_key: str):
+
+    # Identical (model, title, transcript) requests served from memory
+    _SUMMARY_CACHE_SIZE = 256
+
+    # Transcripts longer than the threshold are split into overlapping
+    # chunks and map-reduce summarized; prefill latency and cost grow
+    # linearly with prompt size and huge livestreams overflow the context
+    _CHUNK_THRESHOLD = 60_000
+    _CHUNK_SIZE = 40_000
+    _CHUNK_OVERLAP = 200
+
+    def __init__(self, api_key: str, model_name: str = 'gemini-2.5-flash'):
         """Initialize Gemini handler with API key"""
         genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-2.5-flash')
+        self.model = genai.GenerativeModel(model_name)
         self.logger = logging.getLogger(__name__)
+        # The handler is shared across the scheduler and listener thread
+        # pools; OrderedDict reordering isn't thread-safe, so every cache
+        # touch happens under the lock
+        self._summary_cache = OrderedDict()
+        self._summary_cache_lock = threading.Lock()
     
     def summarize_video(self, transcript: str, video_title: str, channel_name: str) -> Optional[str]:
         """
@@ -29,28 +48,133 @@ class GeminiHandler:
             Summary text or None if failed
         """
         try:
+            # A retried channel or re-submitted video re-asks the exact same
+            # question; answer identical requests from the cache instead of
+            # paying the multi-second LLM call again
+            cache_key = hashlib.blake2b(
+                f"{self.model.model_name}|{video_title}|{transcript}".encode(),
+                digest_size=16
+            ).hexdigest()
+            with self._summary_cache_lock:
+                cached = self._summary_cache.get(cache_key)
+                if cached is not None:
+                    self._summary_cache.move_to_end(cache_key)
+            if cached is not None:
+                self.logger.info(f"Summary cache hit for: {video_title}")
+                return cached
+
             self.logger.info(f"Generating summary for: {video_title}")
-            
-            prompt = f"""
-            Eres un especialista en crear resúmenes de videos financieros y económicos.
-            Resume esta transcripcion de video, destaca los puntos clave y no te dejes nada de información importante.
-            Evita introducciones a lo que vas a hacer ni cierres innecesarios. No uses asteriscos.
-            {transcript}
-            """
-            
-            response = self.model.generate_content(prompt)
-            
-            if response.text:
-                self.logger.info(f"Summary generated: {len(response.text)} characters")
-                return response.text
+
+            if len(transcript) > self._CHUNK_THRESHOLD:
+                summary_text = self._summarize_long_transcript(transcript, video_title)
+            else:
+                prompt = f"""
+                Eres un especialista en crear resúmenes de videos financieros y económicos.
+                Resume esta transcripcion de video, destaca los puntos clave y no te dejes nada de información importante.
+                Evita introducciones a lo que vas a hacer ni cierres innecesarios. No uses asteriscos.
+                {transcript}
+                """
+                response = self.model.generate_content(prompt)
+                summary_text = response.text
+
+            if summary_text:
+                self.logger.info(f"Summary generated: {len(summary_text)} characters")
+                with self._summary_cache_lock:
+                    self._summary_cache[cache_key] = summary_text
+                    if len(self._summary_cache) > self._SUMMARY_CACHE_SIZE:
+                        self._summary_cache.popitem(last=False)
+                return summary_text
             else:
                 self.logger.error("Empty response from Gemini")
                 return None
-                
+
         except Exception as e:
             self.logger.error(f"Error generating summary: {e}")
             return None
 
+    def can_stream(self, transcript: str) -> bool:
+        """Whether a transcript is short enough for stream_summary
+
+        Longer transcripts must go through summarize_video's map-reduce
+        path, which yields nothing incrementally.
+
+        Args:
+            transcript: Full video transcript text
+
+        Returns:
+            True if stream_summary can handle the transcript in one prompt
+        """
+        return len(transcript) <= self._CHUNK_THRESHOLD
+
+    def stream_summary(self, transcript: str, video_title: str):
+        """Yield summary text chunks as Gemini generates them
+
+        Lets callers show the summary progressively (e.g. editing a
+        Telegram message) instead of waiting out the full generation.
+        The caller is responsible for persisting the assembled text;
+        nothing is cached here. Intended for transcripts under the
+        chunking threshold — longer ones should go through
+        summarize_video's map-reduce path.
+
+        Args:
+            transcript: Full video transcript text
+            video_title: Title of the video
+
+        Yields:
+            Text fragments in generation order
+        """
+        self.logger.info(f"Streaming summary for: {video_title}")
+        prompt = f"""
+        Eres un especialista en crear resúmenes de videos financieros y económicos.
+        Resume esta transcripcion de video, destaca los puntos clave y no te dejes nada de información importante.
+        Evita introducciones a lo que vas a hacer ni cierres innecesarios. No uses asteriscos.
+        {transcript}
+        """
+        response = self.model.generate_content(prompt, stream=True)
+        for chunk in response:
+            if chunk.text:
+                yield chunk.text
+
+    def _summarize_long_transcript(self, transcript: str, video_title: str) -> Optional[str]:
+        """Map-reduce summarization for transcripts too long for one prompt
+
+        Overlapping chunks are summarized in parallel, then fused with one
+        final call, so wall time is bounded by the slowest chunk instead of
+        one huge prefill.
+        """
+        step = self._CHUNK_SIZE - self._CHUNK_OVERLAP
+        chunks = [transcript[i:i + self._CHUNK_SIZE] for i in range(0, len(transcript), step)]
+        self.logger.info(
+            f"Transcript of {len(transcript)} chars split into {len(chunks)} chunks"
+        )
+
+        def summarize_chunk(chunk):
+            prompt = f"""
+            Resume esta parte de la transcripcion de un video financiero o económico,
+            destaca los puntos clave y no te dejes nada de información importante.
+            No uses asteriscos.
+            {chunk}
+            """
+            response = self.model.generate_content(prompt)
+            return response.text or ''
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            partials = [p for p in executor.map(summarize_chunk, chunks) if p]
+
+        if not partials:
+            return None
+
+        joined_partials = '\n\n'.join(partials)
+        fuse_prompt = f"""
+        Eres un especialista en crear resúmenes de videos financieros y económicos.
+        Combina estos resúmenes parciales del video "{video_title}" en un único resumen coherente,
+        destaca los puntos clave y no te dejes nada de información importante.
+        Evita introducciones a lo que vas a hacer ni cierres innecesarios. No uses asteriscos.
+        {joined_partials}
+        """
+        response = self.model.generate_content(fuse_prompt)
+        return response.text
+
     def get_todays_news(self) -> Optional[str]:
         """
         Generate a summary of a video transcript
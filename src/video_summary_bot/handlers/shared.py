@@ -0,0 +1,40 @@
+"""Shared handler singletons
+
+The scheduler and the bots each used to build their own handler
+instances; importing from here gives every entry point the same warm
+clients, so connection pools, feed caches and summary caches are shared
+across threads in combined mode.
+"""
+
+from functools import lru_cache
+
+from video_summary_bot.config import youtube_api_key, gemini_api_key, bot_token
+
+from .youtube import YouTubeHandler
+from .gemini import GeminiHandler
+from .telegram import TelegramHandler
+from .youtube_rss import YouTubeRSSHandler
+
+
+@lru_cache(maxsize=1)
+def get_youtube_handler() -> YouTubeHandler:
+    """Process-wide YouTubeHandler instance"""
+    return YouTubeHandler(youtube_api_key)
+
+
+@lru_cache(maxsize=1)
+def get_gemini_handler() -> GeminiHandler:
+    """Process-wide GeminiHandler instance"""
+    return GeminiHandler(gemini_api_key)
+
+
+@lru_cache(maxsize=1)
+def get_telegram_handler() -> TelegramHandler:
+    """Process-wide TelegramHandler instance (no default chat)"""
+    return TelegramHandler(bot_token, None)
+
+
+@lru_cache(maxsize=1)
+def get_rss_handler() -> YouTubeRSSHandler:
+    """Process-wide YouTubeRSSHandler instance"""
+    return YouTubeRSSHandler()
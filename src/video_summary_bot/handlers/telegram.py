@@ -3,129 +3,292 @@ Telegram handler for sending messages
 """
 
 import logging
+import threading
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Optional
 
 
+class _TokenBucket:
+    """Thread-safe token bucket for pacing API calls
+
+    Telegram allows ~30 messages/second globally; pacing below that on
+    our side keeps concurrent broadcasts from tripping flood control and
+    discovering the limit through 429s.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then consume it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
 class TelegramHandler:
     """Handles Telegram bot operations"""
-    
+
+    # Pause after a failed getUpdates poll: callers loop on this method,
+    # and an instant empty return during an outage would turn their loop
+    # into a hot spin of failing requests
+    _POLL_ERROR_BACKOFF = 3
+
     def __init__(self, bot_token: str, chat_id: str):
         """Initialize Telegram handler"""
         self.bot_token = bot_token
         self.chat_id = chat_id
         self.base_url = f"https://api.telegram.org/bot{bot_token}"
+        # One pooled session so every call reuses the TCP+TLS connection;
+        # the pool is sized for a concurrent broadcast and flood-control
+        # 429s / gateway errors retry with backoff instead of dropping
+        # the message. Every Bot API call is a POST, which Retry's
+        # default allowed_methods excludes, so POST is opted in
+        # explicitly. sendMessage is not idempotent: 500 and 504 can
+        # arrive after Telegram already delivered, so retrying them risks
+        # duplicate messages — only 429 (flood control, not delivered)
+        # and 502/503 (refused before reaching the API) are retried.
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.3,
+                              status_forcelist=(429, 502, 503),
+                              allowed_methods=frozenset({'GET', 'POST'}))
+        ))
+        # getUpdates long-polls hold a connection open for ~30s; giving
+        # them their own small pool keeps them from starving a broadcast
+        # (and vice versa)
+        self._updates_session = requests.Session()
+        self._updates_session.mount('https://', HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=2
+        ))
+        # Global send budget shared by every worker in a broadcast, plus
+        # one bucket per chat for Telegram's 1 msg/s per-chat limit
+        self._send_limiter = _TokenBucket(rate=25, capacity=25)
+        self._chat_limiters = {}
+        self._chat_limiters_lock = threading.Lock()
         self.logger = logging.getLogger(__name__)
+
+    def _chat_limiter(self, chat_id) -> _TokenBucket:
+        """Get or create the per-chat rate limiter"""
+        with self._chat_limiters_lock:
+            limiter = self._chat_limiters.get(chat_id)
+            if limiter is None:
+                limiter = self._chat_limiters[chat_id] = _TokenBucket(rate=1, capacity=1)
+            return limiter
+
+    def close(self):
+        """Release the pooled HTTP connections"""
+        self.session.close()
+        self._updates_session.close()
     
-    def send_message(self, text: str, parse_mode: str) -> bool:
+    def send_message(self, text: str, parse_mode: str, chat_id: Optional[str] = None) -> bool:
         """
         Send a text message to Telegram
-        
+
         Args:
             text: Message text to send
             parse_mode: Format for the message ('Markdown' or 'HTML')
-        
+            chat_id: Destination chat; defaults to the handler's chat_id
+
         Returns:
             True if sent successfully, False otherwise
         """
         try:
+            if chat_id is None:
+                chat_id = self.chat_id
             # Split long messages if needed
             max_length = 4000
             if len(text) <= max_length:
-                return self._send_single_message(text, parse_mode)
+                return self._send_single_message(text, parse_mode, chat_id)
             else:
-                return self._send_long_message(text, parse_mode, max_length)
-                
+                return self._send_long_message(text, parse_mode, max_length, chat_id)
+
         except Exception as e:
             self.logger.error(f"Error sending message: {e}")
             return False
-    
-    def _send_single_message(self, text: str, parse_mode: str) -> bool:
+
+    @staticmethod
+    def _message_payload(text: str, parse_mode: str) -> dict:
+        """Build the chat-independent part of a sendMessage payload"""
+        payload = {
+            'text': text,
+            'disable_web_page_preview': True
+        }
+        # Only add parse_mode if it's not None or empty
+        if parse_mode:
+            payload['parse_mode'] = parse_mode
+        return payload
+
+    def _send_single_message(self, text: str, parse_mode: str, chat_id: str) -> bool:
         """Send a single message"""
+        return self._post_message({**self._message_payload(text, parse_mode),
+                                   'chat_id': chat_id})
+
+    def _post_message(self, payload: dict) -> bool:
+        """POST a complete sendMessage payload, respecting rate limits"""
         try:
             url = f"{self.base_url}/sendMessage"
-            
-            payload = {
-                'chat_id': self.chat_id,
-                'text': text,
-                'disable_web_page_preview': True
-            }
-                    # Only add parse_mode if it's not None or empty
-            if parse_mode:
-                payload['parse_mode'] = parse_mode
-            
-            response = requests.post(url, json=payload, timeout=30)
-            
+
+            self._chat_limiter(payload['chat_id']).acquire()
+            self._send_limiter.acquire()
+            response = self.session.post(url, json=payload, timeout=30)
+
             if response.status_code == 200:
                 self.logger.info("Message sent successfully")
                 return True
             else:
                 self.logger.error(f"Failed to send message: {response.status_code} - {response.text}")
                 return False
-                
+
         except Exception as e:
-            self.logger.error(f"Error in _send_single_message: {e}")
+            self.logger.error(f"Error in _post_message: {e}")
             return False
     
-    def _send_long_message(self, text: str, parse_mode: str, max_length: int) -> bool:
+    def send_message_with_id(self, text: str, parse_mode: str,
+                             chat_id: Optional[str] = None) -> Optional[int]:
+        """
+        Send a message and return its message_id, for later edits
+
+        Args:
+            text: Message text to send
+            parse_mode: Format for the message ('Markdown' or 'HTML')
+            chat_id: Destination chat; defaults to the handler's chat_id
+
+        Returns:
+            The Telegram message_id, or None if the send failed
+        """
+        try:
+            if chat_id is None:
+                chat_id = self.chat_id
+            url = f"{self.base_url}/sendMessage"
+            payload = {**self._message_payload(text, parse_mode), 'chat_id': chat_id}
+
+            self._chat_limiter(chat_id).acquire()
+            self._send_limiter.acquire()
+            response = self.session.post(url, json=payload, timeout=30)
+
+            if response.status_code == 200:
+                return response.json()['result']['message_id']
+            self.logger.error(f"Failed to send message: {response.status_code} - {response.text}")
+            return None
+
+        except Exception as e:
+            self.logger.error(f"Error in send_message_with_id: {e}")
+            return None
+
+    def edit_message(self, chat_id: str, message_id: int, text: str,
+                     parse_mode: str = None) -> bool:
+        """
+        Replace the text of an already-sent message
+
+        Args:
+            chat_id: Chat the message lives in
+            message_id: Identifier returned by send_message_with_id
+            text: New message text
+            parse_mode: Format for the message ('Markdown' or 'HTML')
+
+        Returns:
+            True if edited successfully, False otherwise
+        """
+        try:
+            url = f"{self.base_url}/editMessageText"
+            payload = {
+                **self._message_payload(text, parse_mode),
+                'chat_id': chat_id,
+                'message_id': message_id
+            }
+
+            # Edits share the chat's 1 msg/s budget with ordinary sends
+            self._chat_limiter(chat_id).acquire()
+            response = self.session.post(url, json=payload, timeout=30)
+
+            if response.status_code == 200:
+                return True
+            self.logger.error(f"Failed to edit message: {response.status_code} - {response.text}")
+            return False
+
+        except Exception as e:
+            self.logger.error(f"Error in edit_message: {e}")
+            return False
+
+    def _send_long_message(self, text: str, parse_mode: str, max_length: int, chat_id: str) -> bool:
         """Split and send long messages"""
         try:
+            # Single forward pass over the text using indices, so each
+            # part is sliced out once instead of re-copying the whole
+            # tail on every iteration
             parts = []
-            while text:
-                if len(text) <= max_length:
-                    parts.append(text)
-                    break
-                
-                # Find good split point
-                split_point = text.rfind('\n', 0, max_length)
-                if split_point == -1:
-                    split_point = max_length
-                
-                parts.append(text[:split_point])
-                text = text[split_point:].lstrip()
-            
+            i, n = 0, len(text)
+            while i < n:
+                j = min(i + max_length, n)
+                if j < n:
+                    # Prefer to break at a newline inside the window
+                    k = text.rfind('\n', i, j)
+                    if k > i:
+                        j = k
+                parts.append(text[i:j])
+                i = j
+                while i < n and text[i] in ' \n':
+                    i += 1
+
             # Send each part
             success = True
             for i, part in enumerate(parts):
                 if len(parts) > 1:
                     part = f"**Parte {i+1}/{len(parts)}**\n\n{part}"
-                
-                if not self._send_single_message(part, parse_mode):
+
+                # Per-chat limiter inside _send_single_message paces the
+                # parts at 1 msg/s; no fixed sleep needed between them
+                if not self._send_single_message(part, parse_mode, chat_id):
                     success = False
-                
-                # Small delay between parts
-                if i < len(parts) - 1:
-                    import time
-                    time.sleep(2)
-            
+
             return success
             
         except Exception as e:
             self.logger.error(f"Error sending long message: {e}")
             return False
     
-    def send_photo(self, photo_url: str, caption: str = "") -> bool:
+    def send_photo(self, photo_url: str, caption: str = "", chat_id: Optional[str] = None) -> bool:
         """
         Send a photo with optional caption
-        
+
         Args:
             photo_url: URL of the photo to send
             caption: Optional caption for the photo
-        
+            chat_id: Destination chat; defaults to the handler's chat_id
+
         Returns:
             True if sent successfully, False otherwise
         """
         try:
             url = f"{self.base_url}/sendPhoto"
-            
+
             payload = {
-                'chat_id': self.chat_id,
+                'chat_id': chat_id if chat_id is not None else self.chat_id,
                 'photo': photo_url,
                 'caption': caption,
                 'parse_mode': 'Markdown'
             }
             
-            response = requests.post(url, json=payload, timeout=30)
+            response = self.session.post(url, json=payload, timeout=30)
             
             if response.status_code == 200:
                 self.logger.info("Photo sent successfully")
@@ -162,7 +325,7 @@ class TelegramHandler:
         """
         try:
             url = f"{self.base_url}/getMe"
-            response = requests.get(url, timeout=30)
+            response = self.session.get(url, timeout=30)
             
             if response.status_code == 200:
                 return response.json()
@@ -175,58 +338,107 @@ class TelegramHandler:
             return None
         
     def send_to_users(self, text: str, parse_mode: str, user_list: list) -> dict:
-        """Send message to multiple users"""
+        """Send message to multiple users
+
+        Sends fan out over the pooled session so a broadcast costs the
+        slowest round-trip instead of the sum of all of them.
+        """
+        if not user_list:
+            return {}
         results = {}
-        for chat_id in user_list:
-            self.chat_id = chat_id  # Update current chat_id
-            results[chat_id] = self.send_message(text, parse_mode)
+        # The payload only differs by chat_id across recipients, so build
+        # the common part once; long texts fall back to the split path
+        if len(text) <= 4000:
+            base = self._message_payload(text, parse_mode)
+            send = lambda chat_id: self._post_message({**base, 'chat_id': chat_id})
+        else:
+            send = lambda chat_id: self.send_message(text, parse_mode, chat_id)
+        with ThreadPoolExecutor(max_workers=min(16, len(user_list))) as executor:
+            futures = {
+                executor.submit(send, chat_id): chat_id
+                for chat_id in user_list
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
         return results
     
     # method to listen bot input messages
-    def listen_messages(self, offset: Optional[int] = None):
+    def listen_messages(self, offset: Optional[int] = None, timeout: int = 0,
+                        limit: int = 100):
         """
         Listen for incoming messages
 
         Args:
             offset: Update identifier. Only updates with update_id > offset will be returned.
                    Pass the last update_id + 1 to get only new messages.
+            timeout: Seconds the server holds the request open waiting for
+                    updates (long polling). 0 returns immediately.
+            limit: Maximum number of updates per batch (1-100).
 
         Returns:
             JSON response with updates
         """
         url = f"{self.base_url}/getUpdates"
-        params = {}
+        params = {'limit': limit}
         if offset is not None:
             params['offset'] = offset
-        latest_messages = requests.get(url, params=params).json()
+        if timeout:
+            params['timeout'] = timeout
+        # Client-side timeout stays above the server-side hold
+        latest_messages = self._updates_session.get(url, params=params, timeout=timeout + 5).json()
         return latest_messages
 
-    def get_last_message(self, offset: Optional[int] = None) -> Optional[dict]:
+    def get_updates(self, offset: Optional[int] = None, timeout: int = 0,
+                    limit: int = 100) -> list:
         """
-        Get the last message received by the bot
+        Fetch a batch of pending updates
 
         Args:
             offset: Update identifier. Only updates with update_id > offset will be returned.
+            timeout: Long-polling hold in seconds passed to getUpdates.
+            limit: Maximum number of updates per batch (1-100).
 
         Returns:
-            Dict with 'update_id' and 'message' keys, or None if no messages
+            List of update dicts (possibly empty)
         """
         try:
-            response = self.listen_messages(offset=offset)
-
-            if response.get('ok') and response.get('result'):
-                updates = response['result']
-                if updates:
-                    last_update = updates[-1]
-                    return {
-                        'update_id': last_update['update_id'],
-                        'message': last_update.get('message', {})
-                    }
-            return None
-
+            response = self.listen_messages(offset=offset, timeout=timeout, limit=limit)
+            if response.get('ok'):
+                return response.get('result', [])
+            self.logger.error(f"getUpdates returned not-ok: {response}")
+            time.sleep(self._POLL_ERROR_BACKOFF)
+            return []
+        except requests.exceptions.Timeout:
+            # A long poll that expires without updates is normal
+            return []
         except Exception as e:
-            self.logger.error(f"Error getting last message: {e}")
-            return None
+            # Connection refused / DNS failure returns immediately, with
+            # none of the long poll's built-in pacing — back off so the
+            # caller's loop doesn't re-issue the failing request at full
+            # speed for the whole outage
+            self.logger.error(f"Error getting updates: {e}")
+            time.sleep(self._POLL_ERROR_BACKOFF)
+            return []
+
+    def get_last_message(self, offset: Optional[int] = None, timeout: int = 0) -> Optional[dict]:
+        """
+        Get the last message received by the bot
+
+        Args:
+            offset: Update identifier. Only updates with update_id > offset will be returned.
+            timeout: Long-polling hold in seconds passed to getUpdates.
+
+        Returns:
+            Dict with 'update_id' and 'message' keys, or None if no messages
+        """
+        updates = self.get_updates(offset=offset, timeout=timeout)
+        if updates:
+            last_update = updates[-1]
+            return {
+                'update_id': last_update['update_id'],
+                'message': last_update.get('message', {})
+            }
+        return None
 
 
 if __name__ == "__main__":
@@ -3,7 +3,12 @@ YouTube API handler for getting latest videos and transcripts
 """
 
 import logging
-from typing import Optional, Dict
+import requests
+import threading
+from collections import OrderedDict
+from requests.adapters import HTTPAdapter
+from typing import Optional, Dict, List
+from urllib3.util.retry import Retry
 from youtube_transcript_api import YouTubeTranscriptApi
 from googleapiclient.discovery import build
 from datetime import datetime
@@ -11,11 +16,34 @@ from datetime import datetime
 
 class YouTubeHandler:
     """Handles YouTube API operations"""
-    
+
+    # Retried ticks and re-submitted videos re-ask for the same
+    # transcript; keep the most recent ones in memory
+    _TRANSCRIPT_CACHE_SIZE = 64
+
     def __init__(self, api_key: str):
         """Initialize YouTube handler with API key"""
         self.api_key = api_key
         self.youtube = build('youtube', 'v3', developerKey=api_key)
+        # Handle → channel ID never changes; resolving it costs an API
+        # call (or a 100-unit search), so remember every answer
+        self._handle_cache = {}
+        # video_id → transcript text, LRU-bounded. The handler is shared
+        # across thread pools and OrderedDict reordering isn't
+        # thread-safe, so every cache touch happens under the lock
+        self._transcript_cache = OrderedDict()
+        self._transcript_cache_lock = threading.Lock()
+        # One transcript API instance over a pooled session, so fetching
+        # transcripts reuses connections across videos instead of paying
+        # a TLS handshake per call
+        transcript_session = requests.Session()
+        transcript_session.mount('https://', HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=8,
+            max_retries=Retry(total=2, backoff_factor=0.3,
+                              status_forcelist=(502, 503, 504))
+        ))
+        self._transcript_api = YouTubeTranscriptApi(http_client=transcript_session)
         self.logger = logging.getLogger(__name__)
     
     def get_todays_video(self, channel_id: str) -> Optional[Dict]:
@@ -29,136 +57,170 @@ class YouTubeHandler:
             Dict with video info or None if not found
         """
         try:
-            self.logger.info(f"Getting latest video from channel: {channel_id}")
+            self.logger.info("Getting latest video from channel: %s", channel_id)
             
             # If channel_id starts with @, we need to get the actual channel ID first
             if channel_id.startswith('@'):
                 actual_channel_id = self._get_channel_id_from_handle(channel_id)
                 if not actual_channel_id:
-                    self.logger.error(f"Could not find channel ID for handle: {channel_id}")
+                    self.logger.error("Could not find channel ID for handle: %s", channel_id)
                     return None
                 channel_id = actual_channel_id
             
-            # Search for latest video from the channel
-            request = self.youtube.search().list(
-                part='snippet',
-                channelId=channel_id,
-                maxResults=1,
-                order='date',
-                type='video'
+            # Every channel's uploads live in the auto-generated playlist
+            # 'UU' + the channel id suffix; playlistItems.list on it costs
+            # 1 quota unit and returns newest-first, where the old
+            # search.list call burned 100 units for the same answer
+            uploads_playlist_id = 'UU' + channel_id[2:]
+            request = self.youtube.playlistItems().list(
+                part='snippet,contentDetails',
+                playlistId=uploads_playlist_id,
+                maxResults=1
             )
-            
-            response = request.execute()
-            
+
+            response = request.execute(num_retries=2)
+
             if not response.get('items'):
-                self.logger.warning(f"No videos found for channel: {channel_id}")
+                self.logger.warning("No videos found for channel: %s", channel_id)
                 return None
-            
+
             video = response['items'][0]
             today = datetime.now().strftime('%Y-%m-%d')
 
             if video['snippet']['publishedAt'][:10] == today:  # Replace with today's date in 'YYYY-MM-DD' format
                 video_info = {
-                    'id': video['id']['videoId'],
+                    'id': video['contentDetails']['videoId'],
                     'title': video['snippet']['title'],
                     'description': video['snippet']['description'],
                     'published_at': video['snippet']['publishedAt'],
                     'channel_title': video['snippet']['channelTitle'],
                     'thumbnail_url': video['snippet']['thumbnails']['medium']['url']
                 }
-            
-                self.logger.info(f"Found video: {video_info['title']}")
+
+                self.logger.info("Found video: %s", video_info['title'])
                 return video_info
             else:
-                self.logger.info(f"No video published today for channel: {channel_id}")
+                self.logger.info("No video published today for channel: %s", channel_id)
                 return None
             
         except Exception as e:
-            self.logger.error(f"Error getting latest video: {e}")
+            self.logger.error("Error getting latest video: %s", e)
             return None
     
     def _get_channel_id_from_handle(self, handle: str) -> Optional[str]:
         """
         Convert @handle to channel ID
-        
+
         Args:
             handle: Channel handle like '@channelname'
-        
+
         Returns:
             Channel ID or None if not found
         """
+        cached = self._handle_cache.get(handle)
+        if cached:
+            return cached
+
         try:
-            # Remove @ symbol
-            username = handle.replace('@', '')
-            
-            # Try to get channel by username
+            # channels.list with forHandle costs 1 quota unit and resolves
+            # the handle directly, unlike the old search.list fallback
+            # which burned 100 units per lookup
             request = self.youtube.channels().list(
                 part='id',
-                forUsername=username
+                forHandle=handle
             )
-            response = request.execute()
-            
+            response = request.execute(num_retries=2)
+
             if response.get('items'):
-                return response['items'][0]['id']
-            
-            # If not found by username, try searching
-            search_request = self.youtube.search().list(
-                part='snippet',
-                q=handle,
-                type='channel',
-                maxResults=1
+                channel_id = response['items'][0]['id']
+                self._handle_cache[handle] = channel_id
+                return channel_id
+
+            # Legacy channels still resolve by username even when the
+            # handle lookup misses; same 1-unit cost
+            request = self.youtube.channels().list(
+                part='id',
+                forUsername=handle.replace('@', '')
             )
-            search_response = search_request.execute()
-            
-            if search_response.get('items'):
-                return search_response['items'][0]['snippet']['channelId']
-            
+            response = request.execute(num_retries=2)
+
+            if response.get('items'):
+                channel_id = response['items'][0]['id']
+                self._handle_cache[handle] = channel_id
+                return channel_id
+
             return None
-            
+
         except Exception as e:
-            self.logger.error(f"Error converting handle to channel ID: {e}")
+            self.logger.error("Error converting handle to channel ID: %s", e)
             return None
-    
+
     def get_video_info(self, video_id: str) -> Optional[Dict]:
         """
         Get video information by video ID
 
+        Thin wrapper over get_video_infos, so single and batched lookups
+        share one code path.
+
         Args:
             video_id: YouTube video ID
 
         Returns:
             Dict with video info or None if not found
         """
-        try:
-            self.logger.info(f"Getting video info for: {video_id}")
+        video_info = self.get_video_infos([video_id]).get(video_id)
+        if video_info is None:
+            self.logger.warning("No video found with ID: %s", video_id)
+        return video_info
 
-            request = self.youtube.videos().list(
-                part='snippet',
-                id=video_id
-            )
+    def get_video_infos(self, video_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Get information for several videos with batched API calls
 
-            response = request.execute()
+        videos.list accepts up to 50 comma-separated IDs per call, so N
+        lookups cost ceil(N/50) requests (and quota units) instead of N.
 
-            if not response.get('items'):
-                self.logger.warning(f"No video found with ID: {video_id}")
-                return None
+        Args:
+            video_ids: YouTube video IDs
 
-            video = response['items'][0]['snippet']
-            video_info = {
-                'id': video_id,
-                'title': video['title'],
-                'description': video['description'],
-                'published_at': video['publishedAt'],
-                'channel_title': video['channelTitle'],
-                'thumbnail_url': video['thumbnails']['medium']['url']
-            }
-
-            self.logger.info(f"Found video: {video_info['title']}")
-            return video_info
+        Returns:
+            Dict mapping video_id to its info dict (missing IDs omitted)
+        """
+        results = {}
+        try:
+            for start in range(0, len(video_ids), 50):
+                batch = video_ids[start:start + 50]
+                self.logger.info("Getting video info for %s videos", len(batch))
+
+                request = self.youtube.videos().list(
+                    part='snippet',
+                    id=','.join(batch)
+                )
+                response = request.execute(num_retries=2)
+
+                for item in response.get('items', []):
+                    video = item['snippet']
+                    results[item['id']] = {
+                        'id': item['id'],
+                        'title': video['title'],
+                        'description': video['description'],
+                        'published_at': video['publishedAt'],
+                        'channel_title': video['channelTitle'],
+                        'thumbnail_url': video['thumbnails']['medium']['url']
+                    }
+
+            return results
 
         except Exception as e:
-            self.logger.error(f"Error getting video info: {e}")
-            return None
+            self.logger.error("Error getting video infos: %s", e)
+            return results
+
+    def _cache_transcript(self, video_id: str, text: str):
+        """Remember a fetched transcript, evicting the oldest past the cap"""
+        with self._transcript_cache_lock:
+            self._transcript_cache[video_id] = text
+            if len(self._transcript_cache) > self._TRANSCRIPT_CACHE_SIZE:
+                self._transcript_cache.popitem(last=False)
 
     def get_transcript(self, video_id: str) -> Optional[str]:
             """
@@ -171,35 +233,42 @@ class YouTubeHandler:
                 Full transcript text in Spanish or None if not available
             """
             try:
-                self.logger.info(f"Getting Spanish transcript for video: {video_id}")
-                
-                # Initialize transcript API
-                transcript_api = YouTubeTranscriptApi()
-                                
+                # A transcript never changes once published, so a repeat
+                # request skips the network round trip entirely
+                with self._transcript_cache_lock:
+                    cached = self._transcript_cache.get(video_id)
+                    if cached is not None:
+                        self._transcript_cache.move_to_end(video_id)
+                if cached is not None:
+                    self.logger.info("Transcript cache hit for video: %s", video_id)
+                    return cached
+
+                self.logger.info("Getting Spanish transcript for video: %s", video_id)
+
             # Try to find Spanish transcript
             # Try direct fetch first (your working method)
                 try:
-                    transcript = transcript_api.fetch(video_id, languages=['es'])
-                    full_text = ' '.join([snippet.text for snippet in transcript])
-                    self.logger.info(f"Spanish transcript retrieved: {len(full_text)} characters")
+                    transcript = self._transcript_api.fetch(video_id, languages=['es'])
+                    full_text = ' '.join(snippet.text for snippet in transcript)
+                    self.logger.info("Spanish transcript retrieved: %s characters", len(full_text))
+                    self._cache_transcript(video_id, full_text)
                     return full_text
                 except Exception as e:
-                    self.logger.warning(f"Direct fetch failed: {e}")
-                    
+                    self.logger.warning("Direct fetch failed: %s", e)
+
                     # Fallback: try list/find method
                     try:
-                        transcript = transcript_api.fetch(video_id, languages=['en'])
-                        full_text = ' '.join([snippet.text for snippet in transcript])
-                        self.logger.info(f"English transcript retrieved: {len(full_text)} characters")
+                        transcript = self._transcript_api.fetch(video_id, languages=['en'])
+                        full_text = ' '.join(snippet.text for snippet in transcript)
+                        self.logger.info("English transcript retrieved: %s characters", len(full_text))
+                        self._cache_transcript(video_id, full_text)
                         return full_text
                     except Exception as e:
-                        self.logger.warning(f"Direct fetch failed: {e}")
-                    
-                    self.logger.info(f"Spanish transcript retrieved, length: {len(full_text)} characters")
-                    return full_text
-            
+                        self.logger.warning("Direct fetch failed: %s", e)
+                        return None
+
             except Exception as e:
-                self.logger.error(f"Error getting transcript: {e}")
+                self.logger.error("Error getting transcript: %s", e)
                 return None
     
     def get_video_info_with_transcript(self, channel_id: str) -> Optional[Dict]:
@@ -221,7 +290,7 @@ class YouTubeHandler:
             # Get transcript
             transcript = self.get_transcript(video_info['id'])
             if not transcript:
-                self.logger.warning(f"No transcript available for video: {video_info['title']}")
+                self.logger.warning("No transcript available for video: %s", video_info['title'])
                 return video_info  # Return video info even without transcript
             
             # Add transcript to video info
@@ -229,7 +298,7 @@ class YouTubeHandler:
             return video_info
             
         except Exception as e:
-            self.logger.error(f"Error getting video with transcript: {e}")
+            self.logger.error("Error getting video with transcript: %s", e)
             return None
 
 
@@ -1,16 +1,177 @@
-import feedparser
+import hashlib
+import io
 import logging
-from typing import Optional, Dict
-from datetime import datetime, timezone
+import threading
+import time
+import requests
+import xml.etree.ElementTree as ElementTree
+from collections import OrderedDict
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Optional, Dict, List
 from youtube_transcript_api import YouTubeTranscriptApi
 
+from video_summary_bot.utils.dates import today_utc_str
+
+# Namespaces used by YouTube's Atom video feeds
+_ATOM_NS = '{http://www.w3.org/2005/Atom}'
+_YT_NS = '{http://www.youtube.com/xml/schemas/2015}'
+_MEDIA_NS = '{http://search.yahoo.com/mrss/}'
+
+
+def _parse_feed_fast(xml_bytes: bytes, max_entries: int = 1) -> List[Dict]:
+    """Stream-parse a YouTube Atom feed, keeping only the fields we use
+
+    iterparse stops after max_entries and clears elements as it goes, so
+    neither a full DOM nor feedparser's HTML sanitization is paid for.
+    """
+    entries = []
+    for event, elem in ElementTree.iterparse(io.BytesIO(xml_bytes), events=('end',)):
+        if elem.tag != _ATOM_NS + 'entry':
+            continue
+
+        link = elem.find(_ATOM_NS + 'link')
+        thumbnail = elem.find(f'{_MEDIA_NS}group/{_MEDIA_NS}thumbnail')
+        entries.append({
+            'video_id': elem.findtext(_YT_NS + 'videoId', ''),
+            'title': elem.findtext(_ATOM_NS + 'title', ''),
+            'description': elem.findtext(f'{_MEDIA_NS}group/{_MEDIA_NS}description', ''),
+            'published': elem.findtext(_ATOM_NS + 'published', ''),
+            'author': elem.findtext(f'{_ATOM_NS}author/{_ATOM_NS}name', ''),
+            'link': link.get('href', '') if link is not None else '',
+            'thumbnail_url': thumbnail.get('url', '') if thumbnail is not None else ''
+        })
+        elem.clear()
+        if len(entries) >= max_entries:
+            break
+    return entries
+
 
 class YouTubeRSSHandler:
     """Handles YouTube RSS operations without using API quota"""
 
+    # Retried ticks and re-submitted videos re-ask for the same
+    # transcript; keep the most recent ones in memory
+    _TRANSCRIPT_CACHE_SIZE = 64
+
+    # After this many consecutive failed polls a channel is skipped for
+    # the cooldown window, so a dead feed isn't hammered every tick
+    # (the session already retries transient 5xx with backoff)
+    _BREAKER_THRESHOLD = 3
+    _BREAKER_COOLDOWN = 900
+
     def __init__(self):
         """Initialize RSS handler"""
         self.logger = logging.getLogger(__name__)
+        # Fetch feeds over one pooled session and stream-parse the bytes,
+        # instead of letting feedparser open a fresh urllib connection.
+        # Transient gateway errors retry with backoff instead of failing
+        # the whole poll.
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=16,
+            max_retries=Retry(total=2, backoff_factor=0.3,
+                              status_forcelist=(502, 503, 504))
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        # Compressed transfer cuts a typical ~100KB feed to a few KB;
+        # requests decompresses transparently before we parse the bytes
+        self.session.headers.update({
+            'Accept-Encoding': 'gzip, deflate',
+            'User-Agent': 'video-summary-bot/1.0'
+        })
+        # One transcript API instance over its own pooled session, so
+        # fetching transcripts reuses connections across videos instead
+        # of paying a TLS handshake per call
+        transcript_session = requests.Session()
+        transcript_session.mount('https://', HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=8,
+            max_retries=Retry(total=2, backoff_factor=0.3,
+                              status_forcelist=(502, 503, 504))
+        ))
+        self._transcript_api = YouTubeTranscriptApi(http_client=transcript_session)
+        # Per-channel conditional-GET state: {'etag', 'modified', 'entries'}
+        self._feed_cache = {}
+        # (video_id, languages) → transcript text, LRU-bounded
+        self._transcript_cache = OrderedDict()
+        # Circuit-breaker state: consecutive failures and open-until time
+        self._fail_counts = {}
+        self._breaker = {}
+        # The handler is shared across thread pools; OrderedDict
+        # reordering isn't thread-safe and the breaker counters are
+        # read-modify-write, so all of the state above is touched only
+        # under this lock (never held across a network call)
+        self._cache_lock = threading.Lock()
+
+    def _fetch_feed(self, channel_id: str) -> List[Dict]:
+        """Fetch a channel's RSS feed and parse the returned bytes
+
+        Sends If-None-Match / If-Modified-Since when the feed was seen
+        before; on 304 the cached parse is reused with no body transfer.
+        """
+        rss_url = f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
+
+        with self._cache_lock:
+            cached = self._feed_cache.get(channel_id)
+        headers = {}
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('modified'):
+                headers['If-Modified-Since'] = cached['modified']
+
+        response = self.session.get(rss_url, headers=headers, timeout=(3, 8))
+
+        if response.status_code == 304 and cached:
+            self.logger.info("Feed unchanged for %s (304), using cache", channel_id)
+            return cached['entries']
+
+        response.raise_for_status()
+
+        # Second line of defense when the conditional GET isn't honored:
+        # an unchanged body means no new upload, so skip re-parsing it
+        digest = hashlib.blake2b(response.content, digest_size=16).digest()
+        if cached and cached.get('digest') == digest:
+            self.logger.info("Feed body unchanged for %s, using cache", channel_id)
+            return cached['entries']
+
+        entries = _parse_feed_fast(response.content)
+        with self._cache_lock:
+            self._feed_cache[channel_id] = {
+                'etag': response.headers.get('ETag'),
+                'modified': response.headers.get('Last-Modified'),
+                'digest': digest,
+                'entries': entries
+            }
+        return entries
+
+    def _breaker_open(self, channel_id: str) -> bool:
+        """Whether a channel is inside its failure cooldown window"""
+        with self._cache_lock:
+            open_until = self._breaker.get(channel_id)
+            if open_until is None:
+                return False
+            if time.time() < open_until:
+                return True
+            # Cooldown expired; allow one probe attempt
+            del self._breaker[channel_id]
+            return False
+
+    def _record_failure(self, channel_id: str):
+        """Count a failed poll and open the breaker past the threshold"""
+        with self._cache_lock:
+            failures = self._fail_counts.get(channel_id, 0) + 1
+            self._fail_counts[channel_id] = failures
+            if failures >= self._BREAKER_THRESHOLD:
+                self._breaker[channel_id] = time.time() + self._BREAKER_COOLDOWN
+        if failures >= self._BREAKER_THRESHOLD:
+            self.logger.warning(
+                "Channel %s failed %s polls in a row, pausing for %ss",
+                channel_id, failures, self._BREAKER_COOLDOWN
+            )
 
     def get_todays_video_from_rss(self, channel_id: str) -> Optional[Dict]:
         """
@@ -23,48 +184,52 @@ class YouTubeRSSHandler:
         Returns:
             Dict with video info or None if no video today
         """
-        try:
-            self.logger.info(f"Checking RSS feed for channel: {channel_id}")
+        if self._breaker_open(channel_id):
+            self.logger.info("Skipping %s: circuit breaker open", channel_id)
+            return None
 
-            # RSS feed URL
-            rss_url = f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
+        try:
+            self.logger.info("Checking RSS feed for channel: %s", channel_id)
 
-            # Parse RSS feed
-            feed = feedparser.parse(rss_url)
+            # Fetch and parse RSS feed
+            entries = self._fetch_feed(channel_id)
+            with self._cache_lock:
+                self._fail_counts.pop(channel_id, None)
 
-            if not feed.entries:
-                self.logger.warning(f"No entries in RSS feed for: {channel_id}")
+            if not entries:
+                self.logger.warning("No entries in RSS feed for: %s", channel_id)
                 return None
 
             # Get the latest video
-            latest = feed.entries[0]
+            latest = entries[0]
 
-            # Parse published date
-            published = datetime.fromisoformat(latest.published.replace('Z', '+00:00'))
-            today = datetime.now(timezone.utc).date()
+            # The feed publishes fixed-format UTC timestamps, so the date
+            # is just the first 10 characters — no datetime parsing needed
+            published_date = latest['published'][:10]
+            today = today_utc_str()
 
             # Check if published today
-            if published.date() != today:
-                self.logger.info(f"Latest video not from today. Published: {published.date()}, Today: {today}")
+            if published_date != today:
+                self.logger.info("Latest video not from today. Published: %s, Today: %s", published_date, today)
                 return None
 
             # Extract video info
-            video_id = latest.yt_videoid
             video_info = {
-                'id': video_id,
-                'title': latest.title,
-                'description': latest.summary if hasattr(latest, 'summary') else '',
-                'published_at': latest.published,
-                'channel_title': latest.author,
-                'url': latest.link,
-                'thumbnail_url': latest.media_thumbnail[0]['url'] if hasattr(latest, 'media_thumbnail') else ''
+                'id': latest['video_id'],
+                'title': latest['title'],
+                'description': latest['description'],
+                'published_at': latest['published'],
+                'channel_title': latest['author'],
+                'url': latest['link'],
+                'thumbnail_url': latest['thumbnail_url']
             }
 
-            self.logger.info(f"Found today's video: {video_info['title']}")
+            self.logger.info("Found today's video: %s", video_info['title'])
             return video_info
 
         except Exception as e:
-            self.logger.error(f"Error parsing RSS feed: {e}")
+            self.logger.error("Error parsing RSS feed: %s", e)
+            self._record_failure(channel_id)
             return None
 
     def get_transcript(self, video_id: str, languages: list = ['es']) -> Optional[str]:
@@ -79,21 +244,36 @@ class YouTubeRSSHandler:
             Full transcript text or None if not available
         """
         try:
-            self.logger.info(f"Getting transcript for video: {video_id}")
-            transcript_api = YouTubeTranscriptApi()
+            # A transcript never changes once published, so a repeat
+            # request (retried tick, second subscriber wave) skips the
+            # network round trip entirely
+            cache_key = (video_id, tuple(languages))
+            with self._cache_lock:
+                cached = self._transcript_cache.get(cache_key)
+                if cached is not None:
+                    self._transcript_cache.move_to_end(cache_key)
+            if cached is not None:
+                self.logger.info("Transcript cache hit for video: %s", video_id)
+                return cached
+
+            self.logger.info("Getting transcript for video: %s", video_id)
 
             # Use list_transcripts method (correct API usage)
             try:
-                transcript = transcript_api.fetch(video_id=video_id, languages=languages)
-                full_text = ' '.join([snippet.text for snippet in transcript])
-                self.logger.info(f"Transcript retrieved: {len(full_text)} characters")
+                transcript = self._transcript_api.fetch(video_id=video_id, languages=languages)
+                full_text = ' '.join(snippet.text for snippet in transcript)
+                self.logger.info("Transcript retrieved: %s characters", len(full_text))
+                with self._cache_lock:
+                    self._transcript_cache[cache_key] = full_text
+                    if len(self._transcript_cache) > self._TRANSCRIPT_CACHE_SIZE:
+                        self._transcript_cache.popitem(last=False)
                 return full_text
             except Exception as e:
-                self.logger.warning(f"Transcript fetch failed: {e}")
+                self.logger.warning("Transcript fetch failed: %s", e)
                 return None
 
         except Exception as e:
-            self.logger.error(f"Error getting transcript: {e}")
+            self.logger.error("Error getting transcript: %s", e)
             return None
 
     def get_video_info_with_transcript(self, channel_id: str, languages: list = ['es']) -> Optional[Dict]:
@@ -115,7 +295,7 @@ class YouTubeRSSHandler:
             # Get transcript
             transcript = self.get_transcript(video_info['id'], languages)
             if not transcript:
-                self.logger.warning(f"No transcript available for: {video_info['title']}")
+                self.logger.warning("No transcript available for: %s", video_info['title'])
                 return None  # Return None if no transcript (adjust if you want video anyway)
 
             # Add transcript to video info
@@ -125,7 +305,7 @@ class YouTubeRSSHandler:
             return video_info
 
         except Exception as e:
-            self.logger.error(f"Error getting video with transcript: {e}")
+            self.logger.error("Error getting video with transcript: %s", e)
             return None
 
 
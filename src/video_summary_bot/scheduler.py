@@ -1,14 +1,19 @@
 """Scheduler for automated video processing"""
 
 import schedule
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import pytz
 import logging
 
-from video_summary_bot.handlers import YouTubeRSSHandler, GeminiHandler, TelegramHandler
+from video_summary_bot.handlers import (
+    get_rss_handler,
+    get_gemini_handler,
+    get_telegram_handler
+)
 from video_summary_bot.database import Database
-from video_summary_bot.config import gemini_api_key, bot_token
 
 logging.basicConfig(
     level=logging.INFO,
@@ -19,10 +24,10 @@ logger = logging.getLogger(__name__)
 # Timezone Madrid
 madrid_tz = pytz.timezone('Europe/Madrid')
 
-# Handlers
-yt_rss = YouTubeRSSHandler()  # No API key needed - uses RSS feeds!
-gemini = GeminiHandler(gemini_api_key)
-telegram = TelegramHandler(bot_token, None)
+# Handlers (process-wide singletons shared with the other entry points)
+yt_rss = get_rss_handler()  # No API key needed - uses RSS feeds!
+gemini = get_gemini_handler()
+telegram = get_telegram_handler()
 db = Database()
 
 
@@ -31,20 +36,23 @@ def reset_daily_status():
     logger.info("New day - database will track today's videos")
 
 
-def check_and_send_video(channel_handle, youtube_channel_id, channel_language=['es']):
+def check_and_send_video(channel_handle, youtube_channel_id, channel_language=['es'],
+                         target_users=None, today=None):
     """Search for channel video and send if exists"""
-    today = datetime.now().strftime('%Y-%m-%d')
-
-    # Check if already processed today
-    if db.has_video_been_processed(channel_handle, today):
-        logger.info(f"{channel_handle} already processed today")
-        return
+    if today is None:
+        today = datetime.now().strftime('%Y-%m-%d')
 
     logger.info(f"Searching for video from {channel_handle} (RSS)...")
 
     try:
-        # Get subscribers from database
-        target_users = db.get_channel_subscribers(channel_handle)
+        # Callers that pre-fetched the due set pass subscribers along with
+        # an already-verified "not processed today"; fall back to per-channel
+        # lookups for anyone else
+        if target_users is None:
+            if db.has_video_been_processed(channel_handle, today):
+                logger.info(f"{channel_handle} already processed today")
+                return
+            target_users = db.get_channel_subscribers(channel_handle)
 
         if not target_users:
             logger.warning(f"No users subscribed to {channel_handle}")
@@ -106,35 +114,49 @@ def check_and_send_video(channel_handle, youtube_channel_id, channel_language=['
 def check_all_channels():
     """Check all channels with subscribers at their defined times"""
     now = datetime.now(madrid_tz)
+    today = now.strftime('%Y-%m-%d')
+    now_minutes = now.hour * 60 + now.minute
+
+    # One query returns only the channels worth working on — active, in
+    # window, subscribed, not yet processed — with subscribers attached,
+    # instead of three round-trips per channel per tick
+    due_channels = db.get_due_channels(now_minutes, today)
 
-    # Get all active channels
-    channels = db.get_all_channels(active_only=True)
+    if not due_channels:
+        return
+
+    # Each due channel waits on YouTube, Gemini and Telegram in turn, so
+    # running them concurrently makes the tick cost the slowest channel
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for channel in due_channels:
+            executor.submit(process_due_channel, channel, today)
 
-    for channel in channels:
-        # Check if there are subscribers
-        subscribers = db.get_channel_subscribers(channel['channel_handle'])
-        if not subscribers:
-            continue
 
-        # Check if within the time window
-        start_hour = channel['check_start_hour']
-        start_minute = channel['check_start_minute']
-        end_hour = channel['check_end_hour']
+# Handles currently being processed; stops overlapping ticks double-sending
+_in_flight = set()
+_in_flight_lock = threading.Lock()
 
-        # Check if current time is within the window
-        start_time_minutes = start_hour * 60 + start_minute
-        current_time_minutes = now.hour * 60 + now.minute
-        end_time_minutes = end_hour * 60
 
-        if current_time_minutes < start_time_minutes or current_time_minutes >= end_time_minutes:
-            continue
+def process_due_channel(channel, today):
+    """Process one due channel, skipping handles already in flight"""
+    channel_handle = channel['channel_handle']
+    with _in_flight_lock:
+        if channel_handle in _in_flight:
+            logger.info(f"{channel_handle} already being processed, skipping")
+            return
+        _in_flight.add(channel_handle)
 
-        # Process the channel
+    try:
         check_and_send_video(
-            channel['channel_handle'],
+            channel_handle,
             channel.get('youtube_channel_id'),
-            [channel.get('language')]
+            [channel.get('language')],
+            target_users=channel['subscribers'],
+            today=today
         )
+    finally:
+        with _in_flight_lock:
+            _in_flight.discard(channel_handle)
 
 
 # Schedule jobs
@@ -150,7 +172,10 @@ def main():
     check_all_channels()
     while True:
         schedule.run_pending()
-        time.sleep(60)  # Check every minute
+        # Sleep until the next job is due instead of waking every minute;
+        # cap the nap so newly added jobs or clock changes can't strand us
+        idle = schedule.idle_seconds()
+        time.sleep(max(1, min(idle if idle is not None else 60, 300)))
 
 
 if __name__ == "__main__":
@@ -1,6 +1,8 @@
 """Utility functions"""
 
-from .url_parser import extract_video_id
+from .url_parser import extract_video_id, find_video_id
+from .dates import today_str, today_utc_str
 from .logger import setup_logger
 
-__all__ = ['extract_video_id', 'setup_logger']
+__all__ = ['extract_video_id', 'find_video_id', 'today_str',
+           'today_utc_str', 'setup_logger']
@@ -0,0 +1,29 @@
+"""Date helpers shared across the bots, handlers and database layers"""
+
+from datetime import datetime, timezone
+
+# Formatted dates cached per day ordinal; strftime only runs on
+# rollover, and reusing one string object keeps repeat uses (parameter
+# binds, feed-date comparisons) identical
+_today_cache = (0, '')
+_today_utc_cache = (0, '')
+
+
+def today_str() -> str:
+    """Today's local date as YYYY-MM-DD, formatted at most once per day"""
+    global _today_cache
+    now = datetime.now()
+    day = now.toordinal()
+    if day != _today_cache[0]:
+        _today_cache = (day, now.strftime('%Y-%m-%d'))
+    return _today_cache[1]
+
+
+def today_utc_str() -> str:
+    """Today's UTC date as YYYY-MM-DD, formatted at most once per day"""
+    global _today_utc_cache
+    now = datetime.now(timezone.utc)
+    day = now.toordinal()
+    if day != _today_utc_cache[0]:
+        _today_utc_cache = (day, now.strftime('%Y-%m-%d'))
+    return _today_utc_cache[1]
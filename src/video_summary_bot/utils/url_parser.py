@@ -1,10 +1,41 @@
 """URL parsing utilities for YouTube videos"""
 
+import functools
 import re
-from urllib.parse import urlparse, parse_qs
 from typing import Optional
 
+# Compiled once at import; extract_video_id runs on every user message.
+# Both hosts in one alternation, so detection and extraction of a video
+# link is a single scan of the regex engine. The watch branch tolerates
+# query params before v= (e.g. ?feature=shared&v=ID), which covers what
+# the old urlparse fallback existed for.
+_ANY_VIDEO_PATTERN = re.compile(
+    r'(?:https?://)?(?:www\.|m\.)?'
+    r'(?:youtu\.be/|youtube\.com/(?:watch\?(?:[^\s#]*&)?v=|shorts/|embed/|live/))'
+    r'([a-zA-Z0-9_-]{11})'
+)
 
+
+def find_video_id(text: str) -> Optional[str]:
+    """
+    Find a YouTube video ID anywhere in a piece of message text
+
+    Unlike extract_video_id, this is meant for scanning free-form text:
+    detection and extraction happen in one regex pass.
+
+    Args:
+        text: Arbitrary message text
+
+    Returns:
+        Video ID or None if no YouTube link is present
+    """
+    match = _ANY_VIDEO_PATTERN.search(text)
+    return match.group(1) if match else None
+
+
+# Pure string → string, and the same URLs recur across ticks and
+# repeated user messages, so repeats become a dict lookup
+@functools.lru_cache(maxsize=2048)
 def extract_video_id(url: str) -> Optional[str]:
     """
     Extract YouTube video ID from various URL formats:
@@ -20,29 +51,5 @@ def extract_video_id(url: str) -> Optional[str]:
     Returns:
         Video ID or None if not found
     """
-    # Pattern for youtu.be short URLs
-    youtu_be_pattern = r'(?:https?://)?(?:www\.)?youtu\.be/([a-zA-Z0-9_-]{11})'
-    # Pattern for youtube.com URLs (watch, shorts, embed)
-    youtube_pattern = r'(?:https?://)?(?:www\.|m\.)?youtube\.com/(?:watch\?v=|shorts/|embed/)([a-zA-Z0-9_-]{11})'
-
-    # Try youtu.be pattern
-    match = re.search(youtu_be_pattern, url)
-    if match:
-        return match.group(1)
-
-    # Try youtube.com pattern
-    match = re.search(youtube_pattern, url)
-    if match:
-        return match.group(1)
-
-    # Fallback: try parsing as query parameter
-    try:
-        parsed = urlparse(url)
-        if parsed.query:
-            params = parse_qs(parsed.query)
-            if 'v' in params:
-                return params['v'][0]
-    except:
-        pass
-
-    return None
+    match = _ANY_VIDEO_PATTERN.search(url)
+    return match.group(1) if match else None